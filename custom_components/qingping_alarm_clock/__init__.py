@@ -1,16 +1,46 @@
 """The Qingping CGD1 Alarm Clock integration."""
 from __future__ import annotations
 import logging
+import time
+from datetime import timedelta
+
+from bleak.exc import BleakError
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform, CONF_MAC, CONF_NAME
-from homeassistant.core import HomeAssistant, callback, ServiceCall
+from homeassistant.core import CoreState, HomeAssistant, callback, ServiceCall
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth.match import ADDRESS, BluetoothCallbackMatcher
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.typing import ConfigType
 
 from .services import async_register_services
 from .qingping import Qingping
-from .const import DOMAIN
+from .coordinator import QingpingCoordinator
+from .index import async_get_index
+from .transport import async_get_resolver
+from .qingping.mibeacon import XIAOMI_SERVICE_UUID
+from .qingping.exceptions import QingpingError
+from .const import (
+    DOMAIN,
+    STARTUP_RAMP_INTERVAL,
+    CONF_AIRTIME_BUDGET,
+    CONF_SAMPLE_WINDOW,
+    CONF_TEMPERATURE_THRESHOLD,
+    CONF_HUMIDITY_THRESHOLD,
+    CONF_MAX_DEFER,
+    CONF_DEFERRED_FIELDS,
+    DEFAULT_AIRTIME_BUDGET,
+    DEFAULT_SAMPLE_WINDOW,
+    DEFAULT_TEMPERATURE_THRESHOLD,
+    DEFAULT_HUMIDITY_THRESHOLD,
+    DEFAULT_MAX_DEFER,
+    DEFAULT_DEFERRED_FIELDS
+)
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [
@@ -18,24 +48,65 @@ PLATFORMS: list[Platform] = [
     Platform.NUMBER,
     Platform.TIME,
     Platform.SELECT,
-    Platform.BINARY_SENSOR]
+    Platform.BINARY_SENSOR,
+    Platform.SENSOR,
+    Platform.CALENDAR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Qingping CGD1 Alarm Clock integration."""
+    async_register_services(hass)
+    return True
 
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry
 ) -> bool:
     """Set up Qingping CGD1 Alarm Clock from a config entry."""
+    start_time = time.monotonic()
 
     mac = entry.options.get(CONF_MAC, None) or entry.data.get(CONF_MAC, None)
     name = entry.options.get(CONF_NAME, None) or entry.data.get(CONF_NAME, None)
 
-    instance = Qingping(hass, mac, name)
-    entry.runtime_data = instance
+    instance = Qingping(mac, name, async_get_resolver(hass))
+    coordinator = QingpingCoordinator(hass, instance)
+    _async_apply_options(coordinator, entry)
+    await coordinator.async_load()
+    entry.runtime_data = coordinator
+    entry.async_on_unload(coordinator.shutdown)
 
-    async_register_services(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        connections={(CONNECTION_BLUETOOTH, mac)},
+        manufacturer="Qingping",
+        model="CGD1",
+        name=name
+    )
+    index = async_get_index(hass)
+    index.add(device.id, coordinator)
+    entry.async_on_unload(lambda: index.remove(device.id))
+
+    # Entities come up from the cached state. Connections wait until HA has
+    # started and are then let in a few clocks at a time.
+    startup_delay = 0
+    if hass.state is not CoreState.running:
+        startup_delay = index.next_startup_slot() * STARTUP_RAMP_INTERVAL
 
-    async def _connect_if_needed():
-        await instance.connect_if_needed()
+    @callback
+    def _async_at_started(hass: HomeAssistant):
+        entry.async_on_unload(
+            async_call_later(hass, startup_delay, lambda _: coordinator.allow_connections())
+        )
+
+    entry.async_on_unload(async_at_started(hass, _async_at_started))
+
+    async def _handle_advertisement():
+        try:
+            await coordinator.async_handle_advertisement()
+        except (BleakError, QingpingError) as e:
+            # Nothing waits on this; the next advertisement tries again
+            _LOGGER.debug(f"Handling an advertisement of {mac} failed: {e}")
 
     @callback
     def _async_discovered_device(
@@ -44,7 +115,12 @@ async def async_setup_entry(
     ):
         """Subscribe to bluetooth changes."""
         _LOGGER.debug("New service_info: %s", service_info)
-        hass.loop.create_task(_connect_if_needed())
+        service_data = service_info.service_data.get(XIAOMI_SERVICE_UUID)
+        if service_data:
+            coordinator.async_handle_beacon(service_data)
+        entry.async_create_background_task(
+            hass, _handle_advertisement(), f"{DOMAIN} advertisement {mac}"
+        )
 
     entry.async_on_unload(
         bluetooth.async_register_callback(
@@ -58,18 +134,36 @@ async def async_setup_entry(
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
+    _LOGGER.debug(
+        f"Set up {mac} in {(time.monotonic() - start_time) * 1000:.1f} ms, "
+        f"connections allowed in {startup_delay} s after start"
+    )
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        instance: Qingping = entry.runtime_data
-        await instance.disconnect()
+        coordinator: QingpingCoordinator = entry.runtime_data
+        await coordinator.instance.disconnect()
     return unload_ok
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
-    instance: Qingping = entry.runtime_data
-    if entry.title != instance.name:
-        await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
+    coordinator: QingpingCoordinator = entry.runtime_data
+    _async_apply_options(coordinator, entry)
+    coordinator.async_notify_airtime()
+    if entry.title != coordinator.instance.name:
+        await hass.config_entries.async_reload(entry.entry_id)
+
+@callback
+def _async_apply_options(coordinator: QingpingCoordinator, entry: ConfigEntry):
+    options = entry.options
+    coordinator.airtime.budget = options.get(CONF_AIRTIME_BUDGET, DEFAULT_AIRTIME_BUDGET)
+    coordinator.configure_sampling(
+        options.get(CONF_SAMPLE_WINDOW, DEFAULT_SAMPLE_WINDOW),
+        options.get(CONF_TEMPERATURE_THRESHOLD, DEFAULT_TEMPERATURE_THRESHOLD),
+        options.get(CONF_HUMIDITY_THRESHOLD, DEFAULT_HUMIDITY_THRESHOLD)
+    )
+    coordinator.max_defer = timedelta(minutes=options.get(CONF_MAX_DEFER, DEFAULT_MAX_DEFER))
+    coordinator.deferred_fields = set(options.get(CONF_DEFERRED_FIELDS, DEFAULT_DEFERRED_FIELDS))
@@ -0,0 +1,57 @@
+"""Daily radio airtime of a Qingping CGD1 Alarm Clock."""
+from __future__ import annotations
+from datetime import date
+
+from homeassistant.util import dt as dt_util
+
+from .qingping import Qingping
+
+AIRTIME_FIELDS = ("connected_seconds", "connections", "bytes")
+
+
+class QingpingAirtime:
+    """Today's connected time, connections and bytes of one clock.
+
+    They are derived from the ever-growing counters of the instance, which
+    start over with Home Assistant, so totals from earlier in the day are
+    restored from the state cache and carried over.
+    """
+
+    def __init__(self, instance: Qingping):
+        self._instance = instance
+        self.budget = 0  # connected seconds per day, 0 for no limit
+        self.day = dt_util.now().date()
+        self._carried = dict.fromkeys(AIRTIME_FIELDS, 0)
+        self._baseline = self._totals()
+
+    def restore(self, day: date, totals: dict[str, float]):
+        if day == self.day:
+            self._carried = {field: totals.get(field, 0) for field in AIRTIME_FIELDS}
+
+    def today(self) -> dict[str, float]:
+        self._roll()
+        totals = self._totals()
+        return {
+            field: self._carried[field] + totals[field] - self._baseline[field]
+            for field in AIRTIME_FIELDS
+        }
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget > 0 and self.today()["connected_seconds"] >= self.budget
+
+    def _totals(self) -> dict[str, float]:
+        counters = self._instance.counters
+        return {
+            "connected_seconds": self._instance.state.connected_seconds(),
+            "connections": counters["connects"],
+            "bytes": counters["bytes_sent"] + counters["bytes_received"],
+        }
+
+    def _roll(self):
+        # A connection spanning midnight is split between the two days
+        day = dt_util.now().date()
+        if day != self.day:
+            self.day = day
+            self._carried = dict.fromkeys(AIRTIME_FIELDS, 0)
+            self._baseline = self._totals()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.util import dt as dt_util
+
+from .entity import QingpingEntity
+from .coordinator import QingpingCoordinator, FIELD_ALARMS
+
+EVENT_DURATION = timedelta(minutes=1)
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    coordinator: QingpingCoordinator = config_entry.runtime_data
+    async_add_entities([
+        QingpingAlarmsCalendar(coordinator, config_entry)
+    ])
+
+
+class QingpingAlarmsCalendar(QingpingEntity, CalendarEntity):
+    """Alarms as recurring events, read from the cached alarm table only."""
+
+    _fields = ("alarms_on", FIELD_ALARMS)
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = f"{config_entry.data[CONF_NAME]} Alarms"
+        self._attr_unique_id = f"{self._instance.name}_alarms_calendar"
+        self._attr_icon = "mdi:calendar-clock"
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        now = dt_util.now()
+        return next(self._iter_events(now - EVENT_DURATION, now + timedelta(days=7)), None)
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        # Events ending after start_date overlap the range too
+        return list(self._iter_events(start_date - EVENT_DURATION, end_date))
+
+    def _update_from_coordinator(self):
+        pass  # events are expanded from the coordinator timeline on demand
+
+    def _iter_events(self, start: datetime, end: datetime) -> Iterator[CalendarEvent]:
+        if self._coordinator.value("alarms_on") is False:
+            return
+
+        timeline = self._coordinator.timeline
+        for moment, slot in timeline.iter_occurrences(dt_util.as_local(start), end):
+            yield CalendarEvent(
+                start=moment,
+                end=moment + EVENT_DURATION,
+                summary=f"Alarm {slot}",
+                uid=f"{self._instance.name}_alarm_{slot}",
+                recurrence_id=moment.isoformat(),
+            )
@@ -2,26 +2,68 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    SOURCE_IMPORT,
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow
+)
 from homeassistant.const import CONF_MAC, CONF_NAME
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.core import callback
+from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.helpers.device_registry import format_mac
+import homeassistant.helpers.config_validation as cv
 from homeassistant.components.bluetooth import (
+    BluetoothServiceInfoBleak,
     async_discovered_service_info
 )
 
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    CONF_AIRTIME_BUDGET,
+    CONF_SAMPLE_WINDOW,
+    CONF_TEMPERATURE_THRESHOLD,
+    CONF_HUMIDITY_THRESHOLD,
+    CONF_MAX_DEFER,
+    CONF_DEFERRED_FIELDS,
+    DEFAULT_AIRTIME_BUDGET,
+    DEFAULT_SAMPLE_WINDOW,
+    DEFAULT_TEMPERATURE_THRESHOLD,
+    DEFAULT_HUMIDITY_THRESHOLD,
+    DEFAULT_MAX_DEFER,
+    DEFAULT_DEFERRED_FIELDS
+)
 from .qingping import Qingping
+from .qingping.configuration import CONFIGURATION_FIELDS
+from .qingping.mibeacon import XIAOMI_SERVICE_UUID, CGD1_PRODUCT_ID
+from .transport import async_get_resolver
 
 _LOGGER = logging.getLogger(__name__)
 
-XIAOMI_INC = "0000fe95-0000-1000-8000-00805f9b34fb"
 MANUAL_MAC = "manual_mac"
+ADD_ALL = "add_all"
+DEFAULT_NAME = "Qingping CGD1"
+
+
+def _is_device_supported(device_info: BluetoothServiceInfoBleak) -> bool:
+    """Recognize the CGD1 from the product id in its FE95 service data."""
+    service_data = device_info.service_data.get(XIAOMI_SERVICE_UUID)
+    if not service_data or len(service_data) < 4:
+        return False
+
+    return service_data[2] + (service_data[3] << 8) == CGD1_PRODUCT_ID
+
+
+def _default_name(mac: str) -> str:
+    # Entity unique ids derive from the name, so bulk-added clocks need distinct ones
+    return f"{DEFAULT_NAME} {format_mac(mac)[-5:].replace(':', '').upper()}"
 
 
 class CleargrassConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -29,48 +71,95 @@ class CleargrassConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        return QingpingOptionsFlow()
+
     def __init__(self):
         self.mac = None
-        self.name = "Qingping CGD1"
+        self.name = DEFAULT_NAME
+        self._discovered: dict[str, BluetoothServiceInfoBleak] = {}
 
-    def _is_device_supported(self, device_info):
-        service_data = device_info.service_data.get(XIAOMI_INC)
-        if not service_data:
-            return False
+    def _unconfigured_devices(self) -> dict[str, BluetoothServiceInfoBleak]:
+        configured = self._async_current_ids()
+        return {
+            device_info.address: device_info
+            for device_info in async_discovered_service_info(self.hass)
+            if _is_device_supported(device_info)
+            and format_mac(device_info.address) not in configured
+        }
 
-        if service_data and len(service_data) >= 4:
-            if service_data[2] + (service_data[3] << 8) == 0x0576:
-                return True
-        return False
+    async def _validate_device(self) -> str | None:
+        """Make sure the clock is a CGD1 we can talk to, with at most one short connection."""
+        for device_info in async_discovered_service_info(self.hass):
+            if format_mac(device_info.address) == format_mac(self.mac):
+                if _is_device_supported(device_info):
+                    return None  # the advertisement is conclusive
+                break
 
-    async def _validate_device(self, qingping):
-        assert await qingping.connect()
-        await qingping.disconnect()
+        qingping = Qingping(self.mac, self.name, async_get_resolver(self.hass))
+        try:
+            if not await qingping.probe():
+                return "cannot_connect"
+        except Exception as e:
+            _LOGGER.debug(f"Validating {self.mac} failed: {e}")
+            return "cannot_connect"
 
         return None
 
+    async def async_step_bluetooth(
+        self, discovery_info: BluetoothServiceInfoBleak
+    ) -> ConfigFlowResult:
+        """Handle a clock found by the bluetooth integration."""
+        if not _is_device_supported(discovery_info):
+            return self.async_abort(reason="not_supported")
+
+        self.mac = discovery_info.address
+        await self.async_set_unique_id(format_mac(self.mac))
+        self._abort_if_unique_id_configured()
+
+        self.name = _default_name(self.mac)
+        self.context["title_placeholders"] = {"name": self.name}
+        return await self.async_step_bluetooth_confirm()
+
+    async def async_step_bluetooth_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Confirm a discovered clock."""
+        if user_input is not None:
+            return await self.async_step_name()
+
+        self._set_confirm_only()
+        return self.async_show_form(
+            step_id="bluetooth_confirm",
+            description_placeholders={"name": self.name}
+        )
+
     async def async_step_user(
         self,
         user_input: dict[str, Any] | None = None,
         errors: dict[str, str] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
-        errors: dict[str, str] = {}
         if user_input is not None:
             if user_input[CONF_MAC] == MANUAL_MAC:
                 return await self.async_step_manual_mac()
+            if user_input[CONF_MAC] == ADD_ALL:
+                return await self.async_step_add_all()
 
             self.mac = user_input[CONF_MAC]
             await self.async_set_unique_id(format_mac(self.mac), raise_on_progress=False)
             self._abort_if_unique_id_configured()
             return await self.async_step_validate()
 
-        discovered_devices = []
-        for device_info in async_discovered_service_info(self.hass):
-            if self._is_device_supported(device_info):
-                discovered_devices.append(device_info)
+        self._discovered = self._unconfigured_devices()
 
-        device_options = {dev.address: f"{dev.name} ({dev.address})" for dev in discovered_devices}
+        device_options = {
+            address: f"{dev.name} ({address})" for address, dev in self._discovered.items()
+        }
+        if len(self._discovered) > 1:
+            device_options[ADD_ALL] = f"Add all {len(self._discovered)} discovered clocks"
         device_options[MANUAL_MAC] = "Enter MAC address manually"
 
         return self.async_show_form(
@@ -81,12 +170,58 @@ class CleargrassConfigFlow(ConfigFlow, domain=DOMAIN):
             description_placeholders={
                 "description": "Please select a device to configure"
             },
-            errors=errors
+            errors=errors or {}
         )
 
+    async def async_step_add_all(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Add every discovered unconfigured clock without connecting to any of them."""
+        macs = list(self._discovered)
+        self._abort_discovery_flows({format_mac(mac) for mac in macs})
+        results = await asyncio.gather(*(
+            self.hass.config_entries.flow.async_init(
+                DOMAIN,
+                context={"source": SOURCE_IMPORT},
+                data={CONF_MAC: mac, CONF_NAME: _default_name(mac)}
+            )
+            for mac in macs[1:]
+        ))
+        not_added = [
+            f"{mac} ({result.get('reason', result['type'])})"
+            for mac, result in zip(macs[1:], results)
+            if result["type"] != FlowResultType.CREATE_ENTRY
+        ]
+
+        self.mac = macs[0]
+        await self.async_set_unique_id(format_mac(self.mac), raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+        if not_added:
+            _LOGGER.warning(f"Clocks not added in bulk: {', '.join(not_added)}")
+            return self._create_entry(
+                _default_name(self.mac),
+                description="not_added",
+                description_placeholders={"clocks": ", ".join(not_added)}
+            )
+        return self._create_entry(_default_name(self.mac))
+
+    @callback
+    def _abort_discovery_flows(self, unique_ids: set[str]):
+        """Discovery flows for clocks added in bulk would linger, or hold their import back."""
+        for flow in self._async_in_progress(include_uninitialized=True):
+            if flow["context"].get("unique_id") in unique_ids:
+                self.hass.config_entries.flow.async_abort(flow["flow_id"])
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> ConfigFlowResult:
+        """Create an entry for a clock picked in a bulk add."""
+        self.mac = import_data[CONF_MAC]
+        await self.async_set_unique_id(format_mac(self.mac), raise_on_progress=False)
+        self._abort_if_unique_id_configured()
+        return self._create_entry(import_data[CONF_NAME])
+
     async def async_step_manual_mac(
         self, user_input: dict[str, Any] | None = None
-    ) -> FlowResult:
+    ) -> ConfigFlowResult:
         """Handle manual mac step."""
         if user_input is not None:
             self.mac = user_input[CONF_MAC]
@@ -107,16 +242,7 @@ class CleargrassConfigFlow(ConfigFlow, domain=DOMAIN):
         self, user_input: "dict[str, Any] | None" = None
     ) -> ConfigFlowResult:
         """Handle validate step."""
-        error = None
-        qingping = Qingping(self.hass, self.mac, self.name)
-        await self._validate_device(qingping)
-        try:
-            error = await self._validate_device(qingping)
-        except Exception as e:
-            error = str(e)
-        finally:
-            await qingping.disconnect()
-
+        error = await self._validate_device()
         if error:
             return await self.async_step_user(errors={"base": error})
 
@@ -127,15 +253,7 @@ class CleargrassConfigFlow(ConfigFlow, domain=DOMAIN):
     ) -> ConfigFlowResult:
         """Handle name step."""
         if user_input is not None:
-            self.name = user_input[CONF_NAME]
-
-            return self.async_create_entry(
-                title=self.name,
-                data = {
-                    CONF_MAC: self.mac,
-                    CONF_NAME: self.name
-                }
-            )
+            return self._create_entry(user_input[CONF_NAME])
 
         return self.async_show_form(
             step_id="name",
@@ -146,3 +264,57 @@ class CleargrassConfigFlow(ConfigFlow, domain=DOMAIN):
             ),
             errors={},
         )
+
+    def _create_entry(self, name: str, **kwargs: Any) -> ConfigFlowResult:
+        self.name = name
+        return self.async_create_entry(
+            title=self.name,
+            data = {
+                CONF_MAC: self.mac,
+                CONF_NAME: self.name
+            },
+            **kwargs
+        )
+
+
+class QingpingOptionsFlow(OptionsFlow):
+    """Handle the options of a clock."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_AIRTIME_BUDGET,
+                        default=options.get(CONF_AIRTIME_BUDGET, DEFAULT_AIRTIME_BUDGET)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_SAMPLE_WINDOW,
+                        default=options.get(CONF_SAMPLE_WINDOW, DEFAULT_SAMPLE_WINDOW)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10)),
+                    vol.Required(
+                        CONF_TEMPERATURE_THRESHOLD,
+                        default=options.get(CONF_TEMPERATURE_THRESHOLD, DEFAULT_TEMPERATURE_THRESHOLD)
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                    vol.Required(
+                        CONF_HUMIDITY_THRESHOLD,
+                        default=options.get(CONF_HUMIDITY_THRESHOLD, DEFAULT_HUMIDITY_THRESHOLD)
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                    vol.Required(
+                        CONF_MAX_DEFER,
+                        default=options.get(CONF_MAX_DEFER, DEFAULT_MAX_DEFER)
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_DEFERRED_FIELDS,
+                        default=options.get(CONF_DEFERRED_FIELDS, DEFAULT_DEFERRED_FIELDS)
+                    ): cv.multi_select(list(CONFIGURATION_FIELDS)),
+                }
+            ),
+        )
@@ -1,17 +1,46 @@
 """Constants for the Qingping CGD1 Alarm Clock integration."""
 DOMAIN = "qingping_alarm_clock"
 
-ALARM_SLOTS_COUNT = 19
 CONF_ALARM_SLOT = "slot"
 CONF_ALARM_TIME = "time"
 CONF_ALARM_DAYS = "days"
 CONF_ALARM_ENABLED = "enabled"
 CONF_TIME = "time"
+CONF_NIGHT_MODE_ENABLED = "enabled"
+CONF_NIGHT_START_TIME = "start_time"
+CONF_NIGHT_END_TIME = "end_time"
+CONF_DAYTIME_BRIGHTNESS = "daytime_brightness"
+CONF_NIGHTTIME_BRIGHTNESS = "nighttime_brightness"
+CONF_PROFILE = "profile"
+CONF_MAX_AGE = "max_age"
+CONF_DEADLINE = "deadline"
+CONF_AIRTIME_BUDGET = "airtime_budget"
+CONF_SAMPLE_WINDOW = "sample_window"
+CONF_TEMPERATURE_THRESHOLD = "temperature_threshold"
+CONF_HUMIDITY_THRESHOLD = "humidity_threshold"
+CONF_DEFER = "defer"
+CONF_MAX_DEFER = "max_defer"
+CONF_DEFERRED_FIELDS = "deferred_fields"
 
 SERVICE_SET_ALARM = "set_alarm"
+SERVICE_ADD_ALARM = "add_alarm"
 SERVICE_DELETE_ALARM = "delete_alarm"
 SERVICE_SET_TIME = "set_time"
 SERVICE_REFRESH = "refresh"
+SERVICE_SET_NIGHT_MODE_PROFILE = "set_night_mode_profile"
+SERVICE_EXPORT_PROFILE = "export_profile"
+SERVICE_APPLY_PROFILE = "apply_profile"
+SERVICE_GET_ALARMS = "get_alarms"
+SERVICE_GET_CONFIGURATION = "get_configuration"
 
-DISCONNECT_DELAY = 30
-CONNECTION_TIMEOUT = 120
\ No newline at end of file
+SIGNAL_NEXT_ALARM_UPDATED = f"{DOMAIN}_next_alarm_updated"
+
+MAX_CONCURRENT_OPERATIONS = 4
+STARTUP_RAMP_INTERVAL = 5
+DEFAULT_AIRTIME_BUDGET = 0
+DEFAULT_SAMPLE_WINDOW = 300
+DEFAULT_TEMPERATURE_THRESHOLD = 0.5
+DEFAULT_HUMIDITY_THRESHOLD = 2.0
+DEFAULT_MAX_DEFER = 360
+# Display preferences nobody waits on; everything else is written straight away
+DEFAULT_DEFERRED_FIELDS = ["language", "use_24h_format", "use_celsius", "screen_light_time"]
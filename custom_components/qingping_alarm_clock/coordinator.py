@@ -0,0 +1,649 @@
+"""Per-device coordinator for the Qingping CGD1 Alarm Clock integration."""
+from __future__ import annotations
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, time as dtime, timedelta
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.components import bluetooth
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_point_in_utc_time, async_track_time_change
+from homeassistant.util import dt as dt_util
+
+from .qingping import Qingping
+from .qingping.exceptions import (
+    NotConnectedError,
+    AlarmNotConfiguredError,
+    DeadlineExceededError,
+    QingpingError
+)
+from .qingping.timeline import AlarmTimeline
+from .qingping.mibeacon import parse_mibeacon
+from .qingping.sampling import SampledValue
+from .qingping.const import SAMPLE_RING_SIZE
+from .qingping.alarm import Alarm, AlarmDay
+from .qingping.alarm_table import AlarmTable
+from .qingping.configuration import Configuration, CONFIGURATION_FIELDS
+from .qingping.events import (
+    DEVICE_CONNECT,
+    DEVICE_READY,
+    DEVICE_DISCONNECT,
+    DEVICE_CONFIG_UPDATE,
+    ALARMS_UPDATE,
+    WRITES_UPDATE
+)
+from .write_queue import QingpingWriteQueue, encode_field
+from .state_cache import QingpingStateCache
+from .airtime import QingpingAirtime
+from .const import SIGNAL_NEXT_ALARM_UPDATED, DEFAULT_MAX_DEFER, DEFAULT_DEFERRED_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+CONFIG_FIELDS = CONFIGURATION_FIELDS
+FIELD_ALARMS = "alarms"
+FIELD_CONNECTED = "connected"
+FIELD_COUNTERS = "counters"
+FIELD_AIRTIME = "airtime"
+FIELD_TEMPERATURE = "temperature"
+FIELD_HUMIDITY = "humidity"
+
+FIELD_SETTERS = {
+    "sound_volume": "set_sound_volume",
+    "screen_light_time": "set_screen_light_time",
+    "daytime_brightness": "set_daytime_brightness",
+    "nighttime_brightness": "set_nighttime_brightness",
+    "night_time_start_time": "set_nighttime_start_time",
+    "night_time_end_time": "set_nighttime_end_time",
+    "night_mode_enabled": "set_night_mode",
+    "language": "set_language",
+    "use_24h_format": "set_24h_time_format",
+    "use_celsius": "set_uses_celsius",
+    "alarms_on": "enable_alarms",
+}
+
+
+def _alarm_key(time: dtime, days) -> tuple:
+    return time.hour, time.minute, frozenset(days)
+
+
+def _as_ha_error(error: QingpingError) -> HomeAssistantError:
+    """The protocol library knows nothing of HA; translate its errors for the frontend."""
+    if isinstance(error, AlarmNotConfiguredError):
+        return ServiceValidationError(str(error))
+    return HomeAssistantError(str(error))
+
+
+def _is_refusal(error: Exception) -> bool:
+    """Whether retrying a queued write could never succeed, unlike a dropped link or a deadline."""
+    if isinstance(error, (NotConnectedError, DeadlineExceededError)):
+        return False
+    return isinstance(error, (QingpingError, ValueError))
+
+
+class QingpingCoordinator:
+    """Holds the last known state of one clock and fans out field changes."""
+
+    def __init__(self, hass: HomeAssistant, instance: Qingping):
+        self.hass = hass
+        self.instance = instance
+        self.queue = QingpingWriteQueue(hass, instance.mac)
+        self.cache = QingpingStateCache(hass, instance.mac)
+        self.configuration: Configuration | None = None
+        self.is_connected = False
+        self.timeline = AlarmTimeline([])
+        self.airtime = QingpingAirtime(instance)
+        self.climate: dict[str, SampledValue] = {}
+        self.max_defer = timedelta(minutes=DEFAULT_MAX_DEFER)
+        self.deferred_fields: set[str] = set(DEFAULT_DEFERRED_FIELDS)
+
+        self._values: dict[str, Any] = {}
+        self._alarms: AlarmTable | None = None
+        self._alarm_table_frame: bytes | None = None
+        self._stored_alarms_date: datetime | None = None
+        self._free_slots: set[int] = set()
+        self._slots_by_alarm: dict[tuple, set[int]] = {}
+        self._alarm_keys: dict[int, tuple] = {}
+        self._add_alarm_lock = asyncio.Lock()
+        self._listeners: dict[str, set[Callable[[], None]]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._unsub_deferred: CALLBACK_TYPE | None = None
+        self._optimistic: dict[str, tuple[Any, object]] = {}
+        self._rejected: dict[str, Any] = {}
+        self._connections_allowed = False
+        self._beacon_counter: int | None = None
+        self._unsub_midnight = async_track_time_change(
+            hass, self.async_notify_airtime, hour=0, minute=0, second=0
+        )
+
+        instance.eventbus.add_listener(DEVICE_CONNECT, self._on_connect)
+        instance.eventbus.add_listener(DEVICE_READY, self._on_ready)
+        instance.eventbus.add_listener(DEVICE_DISCONNECT, self._on_disconnect)
+        instance.eventbus.add_listener(DEVICE_CONFIG_UPDATE, self._on_config_update)
+        instance.eventbus.add_listener(ALARMS_UPDATE, self._on_alarms_update)
+        instance.eventbus.add_listener(WRITES_UPDATE, self._on_writes_update)
+
+    @callback
+    def async_add_listener(
+        self,
+        field: str,
+        update_callback: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call update_callback whenever field changes. Returns a remover."""
+        self._listeners.setdefault(field, set()).add(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners = self._listeners.get(field)
+            if listeners is None:
+                return
+            listeners.discard(update_callback)
+            if not listeners:
+                del self._listeners[field]
+
+        return remove_listener
+
+    @property
+    def alarms(self) -> list[Alarm]:
+        return list(self._alarms) if self._alarms is not None else []
+
+    def next_alarm(self, moment: datetime) -> tuple[datetime, int] | None:
+        """Next ring time after moment and its slot, None if nothing will ring."""
+        if self.value("alarms_on") is False:
+            return None
+        return self.timeline.next_after(moment)
+
+    def configuration_as_dict(self) -> dict[str, Any] | None:
+        """JSON-friendly form of the last read configuration."""
+        configuration = self.instance.configuration
+        if configuration is None:
+            return None
+        return {field: encode_field(getattr(configuration, field)) for field in CONFIG_FIELDS}
+
+    def alarms_as_list(self) -> list[dict[str, Any]]:
+        """JSON-friendly form of the configured alarms in the last read table."""
+        return [
+            {
+                "slot": alarm.slot,
+                "enabled": alarm.is_enabled,
+                "time": alarm.time.strftime("%H:%M"),
+                "days": alarm.days_string,
+            }
+            # Straight from the instance, listeners may not have caught up with a read yet
+            for alarm in self.instance.alarms if alarm.is_configured
+        ]
+
+    def value(self, field: str) -> Any:
+        """Value to display: optimistic first, then queued, then last readback."""
+        if field in self._optimistic:
+            return self._optimistic[field][0]
+        if field in self.queue.config:
+            return self.queue.config[field]
+        return self._values.get(field)
+
+    def rejected(self, fields: tuple[str, ...]) -> dict[str, Any]:
+        """Requested values the clock did not accept."""
+        return {
+            field: encode_field(self._rejected[field])
+            for field in fields if field in self._rejected
+        }
+
+    def pending(self, fields: tuple[str, ...]) -> dict[str, Any]:
+        """Queued values of the given fields that have not reached the clock yet."""
+        pending = {
+            field: encode_field(self.queue.config[field])
+            for field in fields if field in self.queue.config
+        }
+        if FIELD_ALARMS in fields and self.queue.alarms:
+            pending[FIELD_ALARMS] = sorted(self.queue.alarms)
+        return pending
+
+    @callback
+    def async_notify_airtime(self, now: datetime | None = None):
+        """Refresh the airtime sensors; called at midnight and when the budget changes."""
+        self._notify({FIELD_AIRTIME})
+
+    @callback
+    def configure_sampling(self, window: float, temperature_threshold: float, humidity_threshold: float):
+        for field, threshold in (
+            (FIELD_TEMPERATURE, temperature_threshold),
+            (FIELD_HUMIDITY, humidity_threshold),
+        ):
+            if field in self.climate:
+                self.climate[field].configure(window, threshold)
+            else:
+                self.climate[field] = SampledValue(window, threshold, SAMPLE_RING_SIZE)
+
+    @callback
+    def async_handle_beacon(self, service_data: bytes):
+        """Feed the readings of an advertisement to the samplers, publishing only what they let through."""
+        beacon = parse_mibeacon(service_data)
+        if beacon is None or beacon.counter == self._beacon_counter:
+            return  # the same frame, heard by another adapter or proxy
+        self._beacon_counter = beacon.counter
+
+        moment = time.monotonic()
+        changed = {
+            field for field, sample in (
+                (FIELD_TEMPERATURE, beacon.temperature),
+                (FIELD_HUMIDITY, beacon.humidity),
+            )
+            if sample is not None and self.climate[field].add(moment, sample)
+        }
+        self._notify(changed)
+
+    async def async_load(self):
+        """Restore queued writes and the last known state without connecting."""
+        await self.queue.async_load()
+        await self.cache.async_load()
+        self.instance.restore(self.cache.configuration, self.cache.alarms)
+        self._stored_alarms_date = self.instance.alarms_date
+        if self.cache.airtime is not None:
+            self.airtime.restore(*self.cache.airtime)
+        self._schedule_deferred_flush()
+
+    @callback
+    def allow_connections(self):
+        """Let advertisements trigger connections; held back during startup."""
+        self._connections_allowed = True
+
+    async def async_set_field(self, field: str, value: Any, defer: bool | None = None) -> bool:
+        """Write one configuration field, queueing it if the clock is out of range.
+
+        The value is shown optimistically until the readback confirms it, and
+        rolled back and reported in the "rejected" attribute if the clock
+        reports something else or the write fails.
+
+        A deferred write is queued unless the clock is connected already, and
+        goes out with the next connection made for any other reason, or after
+        max_defer at the latest. defer defaults to whether the field is one of
+        deferred_fields.
+
+        Returns True when the value was written and False when it was queued.
+        """
+        if defer is None:
+            defer = field in self.deferred_fields
+        setter = getattr(self.instance, FIELD_SETTERS[field])
+        return await self._async_write_fields({field: value}, lambda: setter(value), defer)
+
+    async def async_set_fields(self, changes: dict[str, Any], defer: bool | None = None) -> bool:
+        """Like async_set_field, but all fields go out in one configuration write."""
+        if defer is None:
+            defer = changes.keys() <= self.deferred_fields
+        return await self._async_write_fields(
+            changes, lambda: self.instance.update_configuration(changes), defer
+        )
+
+    async def _async_write_fields(
+        self,
+        changes: dict[str, Any],
+        write: Callable[[], Awaitable[Any]],
+        defer: bool
+    ) -> bool:
+        token = object()
+        for field, value in changes.items():
+            self._optimistic[field] = (value, token)
+            self._rejected.pop(field, None)
+        self._notify(set(changes))
+
+        # A no-op is resolved from the cache, even for an out-of-range clock
+        if self._should_write(defer) or self.instance.is_noop_configuration(changes):
+            try:
+                async with self._write_lock:
+                    await write()
+            except NotConnectedError as e:
+                _LOGGER.debug(f"{self.instance.mac} unreachable, queueing {set(changes)}: {e}")
+            except Exception as e:
+                self._settle(changes, token, lambda field: False)
+                if isinstance(e, QingpingError):
+                    raise _as_ha_error(e) from e
+                raise
+            else:
+                configuration = self.instance.configuration
+                self._settle(
+                    changes, token, lambda field: getattr(configuration, field) == changes[field]
+                )
+                return True
+
+        self.queue.put_config(changes, self._defer_until(defer))
+        self._schedule_deferred_flush()
+        self._settle(changes, token, lambda field: None)
+        return False
+
+    async def async_set_alarm(self, slot: int, change: dict, defer: bool = False) -> bool:
+        """Write one alarm slot, queueing it if the clock is out of range."""
+        return await self.async_set_alarms({slot: change}, defer)
+
+    async def async_set_alarms(self, changes: dict[int, dict], defer: bool = False) -> bool:
+        """Write several alarm slots in one session, queueing them if the clock is out of range."""
+        if self._should_write(defer) or self.instance.is_noop_alarms(changes):
+            try:
+                async with self._write_lock:
+                    await self.instance.update_alarms(changes)
+                return True
+            except NotConnectedError as e:
+                _LOGGER.debug(f"{self.instance.mac} unreachable, queueing alarms {sorted(changes)}: {e}")
+            except QingpingError as e:
+                raise _as_ha_error(e) from e
+
+        for slot, change in changes.items():
+            self._validate_queued_alarm(slot, change)
+        defer_until = self._defer_until(defer)
+        for slot, change in changes.items():
+            self.queue.put_alarm(slot, change, defer_until)
+        self._schedule_deferred_flush()
+        self._notify({FIELD_ALARMS})
+        return False
+
+    async def async_apply_profile(
+        self,
+        configuration: Configuration,
+        alarms: AlarmTable,
+        defer: bool = False
+    ) -> bool:
+        """Make the clock match a profile, writing only the fields and slots that differ.
+
+        Both writes go out over the same connection, which lingers between
+        them. Returns False when the profile was queued.
+        """
+        config_written = await self.async_set_fields({
+            field: getattr(configuration, field) for field in CONFIG_FIELDS
+        }, defer)
+
+        changes = {}
+        for alarm in alarms:
+            # A stale table is re-read before writing, so only trust a fresh one to skip slots
+            if self.instance.alarms_are_fresh and \
+                    self.instance.alarms[alarm.slot].to_bytes() == alarm.to_bytes():
+                continue
+            if alarm.is_configured:
+                changes[alarm.slot] = {
+                    "reset": True, "enabled": alarm.is_enabled, "time": alarm.time, "days": alarm.days
+                }
+            else:
+                changes[alarm.slot] = {"reset": True}
+        alarms_written = not changes or await self.async_set_alarms(changes, defer)
+
+        return config_written and alarms_written
+
+    async def async_add_alarm(
+        self,
+        time: dtime,
+        days: list[AlarmDay],
+        is_enabled: bool = True,
+        defer: bool = False
+    ) -> dict[str, Any]:
+        """Put an alarm in the lowest free slot unless a slot already holds it.
+
+        Slots with queued changes are neither reused nor matched against the
+        cached table. Returns the slot, whether it was a duplicate of an
+        existing alarm and whether the write was queued.
+        """
+        async with self._add_alarm_lock:
+            if self._alarms is None:
+                raise ServiceValidationError(
+                    "The alarms of this clock have not been read yet, refresh it first."
+                )
+
+            key = _alarm_key(time, days)
+            queued = self.queue.alarms
+            for slot, change in queued.items():
+                if change.get("time") is not None and change.get("days") is not None \
+                        and _alarm_key(change["time"], change["days"]) == key \
+                        and change.get("enabled") == is_enabled:
+                    return {"slot": slot, "duplicate": True, "queued": True}
+
+            duplicates = self._slots_by_alarm.get(key, set()) - queued.keys()
+            if duplicates:
+                slot = min(duplicates)
+                if self._alarms[slot].is_enabled == is_enabled:
+                    return {"slot": slot, "duplicate": True, "queued": False}
+                change = {"enabled": is_enabled}
+            else:
+                free_slots = self._free_slots - queued.keys()
+                if not free_slots:
+                    raise ServiceValidationError("All alarm slots are in use.")
+                slot = min(free_slots)
+                change = {"enabled": is_enabled, "time": time, "days": days}
+
+            written = await self.async_set_alarm(slot, change, defer)
+            return {"slot": slot, "duplicate": bool(duplicates), "queued": not written}
+
+    async def async_handle_advertisement(self):
+        if not self._connections_allowed:
+            return
+
+        if self.queue.is_due():
+            await self.async_flush()
+        elif self.airtime.over_budget:
+            # Only background refreshes wait for the next day; writes and service calls do not
+            _LOGGER.debug(f"{self.instance.mac} is over its airtime budget, skipping refresh")
+        else:
+            await self.instance.connect_if_needed()
+
+    async def async_flush(self):
+        """Send every queued change in one session."""
+        if self._flush_lock.locked():
+            return
+
+        async with self._flush_lock:
+            config = dict(self.queue.config)
+            alarms = {slot: dict(change) for slot, change in self.queue.alarms.items()}
+            if not config and not alarms:
+                return
+
+            _LOGGER.debug(f"Flushing queued writes to {self.instance.mac}: {config}, {alarms}")
+            try:
+                async with self._write_lock:
+                    refused_config = await self._async_flush_config(config)
+                    await self._async_flush_alarms(alarms)
+            except Exception as e:  # link errors; kept for the next attempt
+                _LOGGER.debug(f"Flushing queued writes to {self.instance.mac} failed: {e}")
+                return
+
+            # Refused entries are dropped too, or they would be retried on every advertisement
+            self._rejected.update(refused_config)
+            self.queue.discard(config, alarms)
+            self._schedule_deferred_flush()
+            self._notify(set(config) | ({FIELD_ALARMS} if alarms else set()))
+
+    async def _async_flush_config(self, config: dict[str, Any]) -> dict[str, Any]:
+        """Write queued configuration fields, returning those the clock can no longer take."""
+        if not config:
+            return {}
+        try:
+            await self.instance.update_configuration(config)
+        except Exception as e:
+            if not _is_refusal(e):
+                raise
+            _LOGGER.warning(f"Dropping queued {config} for {self.instance.mac}: {e}")
+            return config
+        return {}
+
+    async def _async_flush_alarms(self, alarms: dict[int, dict]):
+        """Write queued alarm slots, dropping those that no longer apply."""
+        if not alarms:
+            return
+        try:
+            await self.instance.update_alarms(alarms)
+            return
+        except Exception as e:
+            if not _is_refusal(e):
+                raise
+
+        # One slot that no longer applies fails the whole batch, so find it slot by slot
+        for slot, change in alarms.items():
+            try:
+                await self.instance.update_alarms({slot: change})
+            except Exception as e:
+                if not _is_refusal(e):
+                    raise
+                _LOGGER.warning(f"Dropping queued change {change} to alarm slot {slot} of {self.instance.mac}: {e}")
+
+    def _settle(
+        self,
+        changes: dict[str, Any],
+        token: object,
+        confirmed: Callable[[str], bool | None]
+    ):
+        """Resolve optimistic values. None means the value moved to the queue."""
+        settled = set()
+        for field in changes:
+            if field not in self._optimistic or self._optimistic[field][1] is not token:
+                continue  # superseded by a newer request
+
+            value, _ = self._optimistic.pop(field)
+            field_confirmed = confirmed(field)
+            if field_confirmed is False:
+                _LOGGER.warning(f"{self.instance.mac} did not accept {field}={value}")
+                self._rejected[field] = value
+            if field_confirmed is not None and self.instance.configuration is not None:
+                self._values[field] = getattr(self.instance.configuration, field)
+            settled.add(field)
+
+        self._notify(settled)
+
+    def _should_write(self, defer: bool) -> bool:
+        """Write now, or queue? A deferred write only rides on an open connection."""
+        if defer:
+            return self.is_connected
+        return self._is_reachable()
+
+    def _defer_until(self, defer: bool) -> datetime | None:
+        return dt_util.utcnow() + self.max_defer if defer else None
+
+    @callback
+    def _schedule_deferred_flush(self):
+        """Flush a deferred queue on its own once it has waited max_defer."""
+        if self._unsub_deferred is not None:
+            self._unsub_deferred()
+            self._unsub_deferred = None
+        if self.queue and self.queue.deferred_until is not None:
+            self._unsub_deferred = async_track_point_in_utc_time(
+                self.hass, self._async_deferred_flush_due, self.queue.deferred_until
+            )
+
+    async def _async_deferred_flush_due(self, now: datetime):
+        self._unsub_deferred = None
+        # Out of range, the queue is due now and goes out with the next advertisement
+        if self._connections_allowed and self._is_reachable():
+            await self.async_flush()
+
+    def _is_reachable(self) -> bool:
+        if self.is_connected:
+            return True
+        return bluetooth.async_address_present(self.hass, self.instance.mac, connectable=True)
+
+    def _validate_queued_alarm(self, slot: int, change: dict):
+        if change.keys() == {"reset"}:
+            return
+
+        merged = {}
+        if not change.get("reset"):
+            merged = dict(self.queue.alarms.get(slot, {}))
+        merged.update(change)
+
+        cached = self._alarms[slot] if self._alarms is not None else None
+        base_configured = cached is not None and cached.is_configured and not merged.get("reset")
+        if not base_configured and any(merged.get(key) is None for key in ("enabled", "time", "days")):
+            raise ServiceValidationError("Alarm not configured.")
+
+    def shutdown(self):
+        self._unsub_midnight()
+        if self._unsub_deferred is not None:
+            self._unsub_deferred()
+        bus = self.instance.eventbus
+        bus.remove_listener(DEVICE_CONNECT, self._on_connect)
+        bus.remove_listener(DEVICE_READY, self._on_ready)
+        bus.remove_listener(DEVICE_DISCONNECT, self._on_disconnect)
+        bus.remove_listener(DEVICE_CONFIG_UPDATE, self._on_config_update)
+        bus.remove_listener(ALARMS_UPDATE, self._on_alarms_update)
+        bus.remove_listener(WRITES_UPDATE, self._on_writes_update)
+        self._listeners.clear()
+
+    async def _on_connect(self, instance: Qingping):
+        if not self.is_connected:
+            self.is_connected = True
+            self._notify({FIELD_CONNECTED, FIELD_AIRTIME})
+
+    async def _on_ready(self, instance: Qingping):
+        # Deferred writes ride along with a connection made for any other reason
+        if self.queue:
+            await self.async_flush()
+
+    async def _on_disconnect(self, instance: Qingping):
+        if self.is_connected:
+            self.is_connected = False
+            totals = self.airtime.today()  # rolls the day over first if needed
+            self.cache.put_airtime(self.airtime.day, totals)
+            self._notify({FIELD_CONNECTED, FIELD_AIRTIME})
+
+
+    async def _on_writes_update(self, counters: dict[str, int]):
+        self._notify({FIELD_COUNTERS})
+
+    async def _on_config_update(self, configuration: Configuration):
+        self.configuration = configuration
+        self.cache.put_configuration(configuration)
+
+        changed = set()
+        for field in CONFIG_FIELDS:
+            value = getattr(configuration, field)
+            if field not in self._values or self._values[field] != value:
+                self._values[field] = value
+                changed.add(field)
+
+        _LOGGER.debug(f"{self.instance.mac} configuration changed: {changed or 'nothing'}")
+        self._notify(changed)
+
+    async def _on_alarms_update(self, table: AlarmTable):
+        # Pages are copied into the table one at a time, so only re-index the slots they changed
+        self._alarms = table
+        # alarms_date only moves once the last page of a read is in; store the whole table then
+        alarms_date = self.instance.alarms_date
+        if alarms_date is not None and alarms_date != self._stored_alarms_date:
+            self._stored_alarms_date = alarms_date
+            self.cache.put_alarms(table, alarms_date)
+
+        frame = table.to_bytes()
+        if frame == self._alarm_table_frame:
+            return
+
+        for slot in table.changed_slots(self._alarm_table_frame):
+            self._index_alarm(table[slot])
+        self._alarm_table_frame = frame
+
+        self.timeline = AlarmTimeline(table)
+        self._notify({FIELD_ALARMS})
+
+    def _index_alarm(self, alarm: Alarm):
+        """Keep the free slots and the slots of each (time, days) up to date."""
+        old_key = self._alarm_keys.pop(alarm.slot, None)
+        if old_key is not None:
+            self._slots_by_alarm[old_key].discard(alarm.slot)
+            if not self._slots_by_alarm[old_key]:
+                del self._slots_by_alarm[old_key]
+
+        if alarm.is_configured:
+            self._free_slots.discard(alarm.slot)
+            key = _alarm_key(alarm.time, alarm.days)
+            self._alarm_keys[alarm.slot] = key
+            self._slots_by_alarm.setdefault(key, set()).add(alarm.slot)
+        else:
+            self._free_slots.add(alarm.slot)
+
+    def _notify(self, fields: set[str]):
+        # An entity bound to several fields is only written once per update
+        callbacks = set()
+        for field in fields:
+            callbacks.update(self._listeners.get(field, ()))
+
+        for update_callback in callbacks:
+            update_callback()
+
+        if FIELD_ALARMS in fields or "alarms_on" in fields:
+            async_dispatcher_send(self.hass, SIGNAL_NEXT_ALARM_UPDATED)
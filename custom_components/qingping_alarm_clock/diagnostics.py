@@ -0,0 +1,68 @@
+"""Diagnostics support for the Qingping CGD1 Alarm Clock integration."""
+from __future__ import annotations
+from datetime import datetime, timezone
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_MAC
+from homeassistant.core import HomeAssistant
+
+from .coordinator import QingpingCoordinator, CONFIG_FIELDS, FIELD_ALARMS
+from .transport import async_get_resolver
+
+TO_REDACT = {CONF_MAC, "mac"}
+
+
+def _timestamp(value: float) -> str:
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Everything comes from memory; the clock is never contacted."""
+    coordinator: QingpingCoordinator = entry.runtime_data
+    instance = coordinator.instance
+    configuration = instance.configuration
+
+    return async_redact_data({
+        "entry": dict(entry.data),
+        "connected": coordinator.is_connected,
+        "configuration": None if configuration is None else {
+            "date": configuration.date.isoformat(),
+            **coordinator.configuration_as_dict(),
+        },
+        "alarms": {
+            "date": instance.alarms_date.isoformat() if instance.alarms_date else None,
+            "table": instance.alarms.to_bytes().hex(),
+            "configured": coordinator.alarms_as_list(),
+        },
+        "pending": coordinator.pending(CONFIG_FIELDS + (FIELD_ALARMS,)),
+        "counters": dict(instance.counters),
+        "airtime": {
+            "day": coordinator.airtime.day.isoformat(),
+            "budget": coordinator.airtime.budget,
+            **coordinator.airtime.today(),
+        },
+        # Home Assistant picks the path when connecting; these are the ones it can pick from
+        "paths": [
+            {"source": path.source, "rssi": path.rssi}
+            for path in async_get_resolver(hass)(instance.mac)
+        ],
+        "connection": {
+            "state": instance.state.state.value,
+            "time_in_state": {
+                state.value: round(seconds, 1)
+                for state, seconds in instance.state.time_in_state().items()
+            },
+            "history": [
+                {"time": _timestamp(moment), "state": state.value}
+                for moment, state in instance.state.history
+            ],
+        },
+        "frames": [
+            {"time": _timestamp(moment), "direction": direction, "data": data.hex()}
+            for moment, direction, data in instance.frames
+        ],
+    }, TO_REDACT)
@@ -1,8 +1,13 @@
 from __future__ import annotations
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity import DeviceInfo, Entity
 from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH
 
+from .coordinator import QingpingCoordinator
 from .qingping import Qingping
 
 @callback
@@ -12,4 +17,49 @@ def async_device_device_info_fn(qingping: Qingping, name: str) -> DeviceInfo:
         manufacturer="Qingping",
         model="CGD1",
         name=name
-    )
\ No newline at end of file
+    )
+
+
+class QingpingEntity(Entity):
+    """Base entity that is only written when one of its fields changes."""
+
+    _attr_should_poll = False
+    _fields: tuple[str, ...] = ()
+
+    def __init__(self, coordinator: QingpingCoordinator, config_entry: ConfigEntry):
+        self._coordinator = coordinator
+        self._instance: Qingping = coordinator.instance
+        self._config_entry = config_entry
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return async_device_device_info_fn(self._instance, self._config_entry.data[CONF_NAME])
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        attributes = dict(getattr(self, "_attr_extra_state_attributes", None) or {})
+        pending = self._coordinator.pending(self._fields)
+        if pending:
+            attributes["pending"] = pending
+        rejected = self._coordinator.rejected(self._fields)
+        if rejected:
+            attributes["rejected"] = rejected
+        return attributes or None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        for field in self._fields:
+            self.async_on_remove(
+                self._coordinator.async_add_listener(field, self._handle_coordinator_update)
+            )
+        self._update_from_coordinator()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._update_from_coordinator()
+        self.async_write_ha_state()
+
+    @callback
+    def _update_from_coordinator(self) -> None:
+        """Copy the bound fields from the coordinator into the entity attributes."""
+        raise NotImplementedError
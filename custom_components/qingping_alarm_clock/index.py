@@ -0,0 +1,80 @@
+"""Lookup of configured clocks by device id and MAC address."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .coordinator import QingpingCoordinator
+from .const import DOMAIN, SIGNAL_NEXT_ALARM_UPDATED
+
+
+class QingpingIndex:
+    """Maintained on entry setup and unload so service calls never scan entries."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._by_device_id: dict[str, QingpingCoordinator] = {}
+        self._by_mac: dict[str, QingpingCoordinator] = {}
+        self._startup_slots = 0
+
+        # The fleet-wide sensor belongs to no clock; any loaded entry may host it
+        self.fleet_sensor: Entity | None = None
+        self.sensor_adders: dict[str, AddEntitiesCallback] = {}
+
+    def __len__(self):
+        return len(self._by_device_id)
+
+    @property
+    def device_ids(self) -> list[str]:
+        return list(self._by_device_id)
+
+    @property
+    def coordinators(self) -> list[QingpingCoordinator]:
+        return list(self._by_device_id.values())
+
+    @callback
+    def next_startup_slot(self) -> int:
+        """Position of a clock in the staggered startup ramp."""
+        slot = self._startup_slots
+        self._startup_slots += 1
+        return slot
+
+    @callback
+    def add(self, device_id: str, coordinator: QingpingCoordinator):
+        self._by_device_id[device_id] = coordinator
+        self._by_mac[format_mac(coordinator.instance.mac)] = coordinator
+        async_dispatcher_send(self._hass, SIGNAL_NEXT_ALARM_UPDATED)
+
+    @callback
+    def remove(self, device_id: str):
+        coordinator = self._by_device_id.pop(device_id, None)
+        if coordinator is not None:
+            self._by_mac.pop(format_mac(coordinator.instance.mac), None)
+            async_dispatcher_send(self._hass, SIGNAL_NEXT_ALARM_UPDATED)
+
+    def get_by_device_id(self, device_id: str) -> QingpingCoordinator:
+        coordinator = self._by_device_id.get(device_id)
+        if coordinator is None:
+            raise ServiceValidationError(
+                f"Device {device_id} is not a loaded Qingping alarm clock."
+            )
+        return coordinator
+
+    def get_by_mac(self, mac: str) -> QingpingCoordinator:
+        coordinator = self._by_mac.get(format_mac(mac))
+        if coordinator is None:
+            raise ServiceValidationError(
+                f"No loaded Qingping alarm clock with address {mac}."
+            )
+        return coordinator
+
+
+@callback
+def async_get_index(hass: HomeAssistant) -> QingpingIndex:
+    if DOMAIN not in hass.data:
+        hass.data[DOMAIN] = QingpingIndex(hass)
+    return hass.data[DOMAIN]
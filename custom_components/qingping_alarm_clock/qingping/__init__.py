@@ -2,5 +2,7 @@ from .qingping import Qingping
 from .configuration import Configuration
 from .alarm import Alarm, AlarmDay
 from .eventbus import EventBus
+from .exceptions import QingpingError
+from .transport import Path
 
-__all__ = ["Qingping", "Configuration", "Alarm", "AlarmDay", "EventBus"]
\ No newline at end of file
+__all__ = ["Qingping", "Configuration", "Alarm", "AlarmDay", "EventBus", "QingpingError", "Path"]
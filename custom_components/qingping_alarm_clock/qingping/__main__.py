@@ -0,0 +1,241 @@
+"""Bulk operations on Qingping CGD1 clocks outside Home Assistant.
+
+    python -m qingping dump AA:BB:CC:DD:EE:FF 11:22:33:44:55:66
+    python -m qingping apply-profile @bedroom.profile AA:BB:CC:DD:EE:FF
+    python -m qingping sync-time AA:BB:CC:DD:EE:FF
+    python -m qingping --simulate bench --rounds 20 AA:BB:CC:DD:EE:FF
+    python -m qingping --simulate --concurrency 50 boot --ramp 0.5 AA:BB:CC:DD:EE:FF ...
+
+Each clock is handled concurrently, up to --concurrency at a time, and gets
+one JSON line on stdout. The exit status is 1 if any clock failed.
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, time as dtime
+from enum import Enum
+from typing import Any
+
+from .qingping import Qingping
+from .configuration import CONFIGURATION_FIELDS
+from .deadline import deadline_scope
+from .exceptions import DeadlineExceededError
+from .profile import encode_profile, decode_profile
+from .transport import Resolver, bleak_client, scan_with_bleak
+
+Operation = Callable[[Qingping, argparse.Namespace], Awaitable[dict[str, Any]]]
+
+
+def _json_default(value):
+    if isinstance(value, dtime):
+        return value.strftime("%H:%M")
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def _dump(instance: Qingping, args: argparse.Namespace) -> dict[str, Any]:
+    if not await instance.connect():
+        raise ConnectionError("No connectable path")
+    configuration = instance.configuration
+    return {
+        "configuration": {field: getattr(configuration, field) for field in CONFIGURATION_FIELDS},
+        "alarms": [
+            {"slot": alarm.slot, "enabled": alarm.is_enabled, "time": alarm.time, "days": alarm.days_string}
+            for alarm in instance.alarms if alarm.is_configured
+        ],
+        "profile": encode_profile(configuration, instance.alarms),
+    }
+
+
+async def _apply_profile(instance: Qingping, args: argparse.Namespace) -> dict[str, Any]:
+    configuration, alarms = args.profile
+    config_written = await instance.update_configuration({
+        field: getattr(configuration, field) for field in CONFIGURATION_FIELDS
+    })
+    # Slots already holding the profile's alarm are skipped by update_alarms
+    alarms_written = await instance.update_alarms({
+        alarm.slot: {"reset": True, "enabled": alarm.is_enabled, "time": alarm.time, "days": alarm.days}
+        if alarm.is_configured else {"reset": True}
+        for alarm in alarms
+    })
+    return {"configuration_written": config_written, "alarms_written": alarms_written}
+
+
+async def _sync_time(instance: Qingping, args: argparse.Namespace) -> dict[str, Any]:
+    timezone_offset = args.timezone_offset
+    if timezone_offset is None:
+        timezone_offset = int(datetime.now().astimezone().utcoffset().total_seconds() / 60)
+    await instance.set_time(int(time.time()), timezone_offset)
+    return {"timezone_offset": timezone_offset}
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    samples = sorted(samples)
+    return {
+        "min": round(samples[0] * 1000, 1),
+        "median": round(statistics.median(samples) * 1000, 1),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 1),
+        "max": round(samples[-1] * 1000, 1),
+    }
+
+
+async def _bench(instance: Qingping, args: argparse.Namespace) -> dict[str, Any]:
+    """Connect, read both tables back and disconnect, rounds times over.
+
+    connect includes authentication and the initial read of both tables.
+    """
+    phases: dict[str, list[float]] = {"connect": [], "configuration": [], "alarms": [], "disconnect": []}
+    for _ in range(args.rounds):
+        for phase, step in (
+            ("connect", instance.connect),
+            ("configuration", instance.get_configuration),
+            ("alarms", instance.get_alarms),
+            ("disconnect", instance.disconnect),
+        ):
+            start = time.perf_counter()
+            result = await step()
+            if phase == "connect" and not result:
+                raise ConnectionError("No connectable path")
+            phases[phase].append(time.perf_counter() - start)
+
+    return {"rounds": args.rounds, "latency_ms": {phase: _summary(samples) for phase, samples in phases.items()}}
+
+
+async def _max_loop_lag(stop: asyncio.Event) -> float:
+    """How late the event loop ran a 1 ms timer at worst, until stop is set."""
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        worst = max(worst, time.perf_counter() - start - 0.001)
+    return worst
+
+
+async def _boot(instance: Qingping, args: argparse.Namespace) -> dict[str, Any]:
+    """Connect the way Home Assistant does once started: clock n waits n times --ramp.
+
+    Run it with --ramp 0 to compare against every clock connecting at once.
+    """
+    slot = list(dict.fromkeys(args.macs)).index(instance.mac)
+    await asyncio.sleep(max(0.0, args.started + slot * args.ramp - time.monotonic()))
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(_max_loop_lag(stop))
+    start = time.perf_counter()
+    try:
+        if not await instance.connect():
+            raise ConnectionError("No connectable path")
+        connect = time.perf_counter() - start
+    finally:
+        stop.set()
+    return {
+        "waited": round(slot * args.ramp, 3),
+        "connect_ms": round(connect * 1000, 1),
+        "max_loop_lag_ms": round(await lag * 1000, 1),
+    }
+
+
+OPERATIONS: dict[str, Operation] = {
+    "dump": _dump,
+    "apply-profile": _apply_profile,
+    "sync-time": _sync_time,
+    "bench": _bench,
+    "boot": _boot,
+}
+
+
+def _read_profile(value: str):
+    if value.startswith("@"):
+        with open(value[1:], encoding="utf-8") as file:
+            value = file.read().strip()
+    try:
+        return decode_profile(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m qingping", description="Bulk operations on Qingping CGD1 alarm clocks."
+    )
+    parser.add_argument("--simulate", action="store_true", help="talk to emulated clocks instead of Bluetooth")
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated write latency in seconds")
+    parser.add_argument("--mtu", type=int, help="split simulated notifications into chunks of this size")
+    parser.add_argument("--concurrency", type=int, default=4, help="clocks handled at the same time")
+    parser.add_argument("--deadline", type=float, help="give up on a clock after this many seconds")
+    parser.add_argument("--scan-timeout", type=float, default=10.0, help="seconds to scan for the clocks")
+    parser.add_argument("-v", "--verbose", action="store_true")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("dump", help="print configuration, alarms and a profile of each clock")
+    apply_profile = commands.add_parser("apply-profile", help="write a profile from export_profile or dump")
+    apply_profile.add_argument("profile", type=_read_profile, help="the profile, or @file to read it from")
+    sync_time = commands.add_parser("sync-time", help="set each clock to the local time")
+    sync_time.add_argument("--timezone-offset", type=int, help="minutes east of UTC, the local offset if unset")
+    bench = commands.add_parser("bench", help="measure connect and readback latency")
+    bench.add_argument("--rounds", type=int, default=10)
+    boot = commands.add_parser("boot", help="measure a staggered startup; raise --concurrency to run all clocks")
+    boot.add_argument("--ramp", type=float, default=5.0, help="seconds between two clocks connecting")
+
+    for command in commands.choices.values():
+        command.add_argument("macs", nargs="+", metavar="MAC")
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> bool:
+    operation = OPERATIONS[args.command]
+
+    def make_instance(mac: str) -> Qingping:
+        if args.simulate:
+            from .simulator import SimulatedClock
+
+            clock = SimulatedClock(latency=args.latency, mtu=args.mtu)
+            return Qingping(mac, mac, clock.resolver, clock.client_factory, discovery_delay=0)
+        return Qingping(mac, mac, resolver, bleak_client)
+
+    resolver: Resolver | None = None
+    if not args.simulate:
+        resolver = await scan_with_bleak(args.scan_timeout)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    args.started = time.monotonic()  # boot ramps from here
+
+    async def run(mac: str) -> bool:
+        instance = make_instance(mac)
+        result: dict[str, Any] = {"mac": mac}
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                with deadline_scope(args.deadline):
+                    result.update(await operation(instance, args))
+                result["success"] = True
+            except Exception as e:  # one failing clock must not abort the others
+                result["success"] = False
+                result["error"] = str(e) or type(e).__name__
+                if isinstance(e, DeadlineExceededError):
+                    result["phase"] = e.phase
+            finally:
+                with contextlib.suppress(Exception):
+                    await instance.disconnect()
+            result["seconds"] = round(time.perf_counter() - start, 3)
+        print(json.dumps(result, default=_json_default), flush=True)
+        return result["success"]
+
+    return all(await asyncio.gather(*(run(mac) for mac in dict.fromkeys(args.macs))))
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    return 0 if asyncio.run(_run(args)) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,6 @@
-import logging
 from enum import Enum
 from datetime import time as dtime
 
-_LOGGER = logging.getLogger(__name__)
-
 
 class AlarmDay(Enum):
     MONDAY = 1
@@ -15,24 +12,53 @@ class AlarmDay(Enum):
     SUNDAY = 7
 
 
+UNSET = 0xff
+
+
 class Alarm:
-    is_enabled: bool | None = None
-    hour: int | None = None
-    minute: int | None = None
-    days: set[AlarmDay] | None = None
+    """One 5-byte alarm slot.
+
+    The bytes may be a memoryview into an AlarmTable, in which case the alarm
+    is a live view of the table; copy() detaches it before changing it.
+    """
 
-    def __init__(self, slot: int, alarm_bytes: bytes):
+    __slots__ = ("slot", "_data")
+
+    def __init__(self, slot: int, alarm_bytes: bytes | bytearray | memoryview):
         self.slot = slot
+        self._data = alarm_bytes if isinstance(alarm_bytes, memoryview) else bytearray(alarm_bytes)
+
+    @property
+    def is_enabled(self) -> bool | None:
+        return None if self._data[0] == UNSET else self._data[0] == 1
 
-        if alarm_bytes == bytes.fromhex("ffffffffff"):
-            return
+    @is_enabled.setter
+    def is_enabled(self, value: bool | None):
+        self._data[0] = UNSET if value is None else int(value)
 
-        self.is_enabled = alarm_bytes[0] == 1
-        self.hour = alarm_bytes[1]
-        self.minute = alarm_bytes[2]
-        self.days = self._bitmask_to_days(alarm_bytes[3])
+    @property
+    def hour(self) -> int | None:
+        return None if self._data[1] == UNSET else self._data[1]
 
-        _LOGGER.debug(f"Alarm #{self.slot} enabled: {self.is_enabled}, hour: {self.hour}, minute: {self.minute}, days: {self.days}")
+    @hour.setter
+    def hour(self, value: int | None):
+        self._data[1] = UNSET if value is None else value
+
+    @property
+    def minute(self) -> int | None:
+        return None if self._data[2] == UNSET else self._data[2]
+
+    @minute.setter
+    def minute(self, value: int | None):
+        self._data[2] = UNSET if value is None else value
+
+    @property
+    def days(self) -> list[AlarmDay] | None:
+        return None if self._data[3] == UNSET else self._bitmask_to_days(self._data[3])
+
+    @days.setter
+    def days(self, value: set[AlarmDay] | None):
+        self._data[3] = UNSET if value is None else self._days_to_bitmask(value)
 
     @property
     def is_configured(self):
@@ -66,25 +92,15 @@ class Alarm:
         return ",".join(abbreviations)
 
     def to_bytes(self) -> bytes:
-        byte_array = [0x07, 0x05]
-        byte_array.append(self.slot)
-
         if self.is_configured:
-            byte_array.append(0x01 if self.is_enabled else 0x00)
-            byte_array.append(self.hour)
-            byte_array.append(self.minute)
-            byte_array.append(self._days_to_bitmask(self.days))
-            byte_array.append(0x00)
-        else:
-            byte_array.extend([0xff, 0xff, 0xff, 0xff, 0xff])
+            return bytes([0x07, 0x05, self.slot]) + bytes(self._data[:4]) + b"\x00"
+        return bytes([0x07, 0x05, self.slot]) + bytes([UNSET] * 5)
 
-        return bytes(byte_array)
+    def copy(self) -> "Alarm":
+        return Alarm(self.slot, bytes(self._data))
 
     def deactivate(self):
-        self.is_enabled = None
-        self.hour = None
-        self.minute = None
-        self.days = None
+        self._data[:] = bytes([UNSET] * 5)
 
     def _bitmask_to_days(self, bitmask: int):
         bit_to_day = {
@@ -0,0 +1,55 @@
+from collections.abc import Iterator
+
+from .alarm import Alarm, UNSET
+from .const import ALARM_SLOTS_COUNT
+
+SLOT_SIZE = 5
+SLOTS_PER_PAGE = 3
+
+
+class AlarmTable:
+    """All alarm slots of a clock in one fixed buffer.
+
+    Pages read from the clock are copied into place, and Alarm objects are
+    views created on demand, so a refresh allocates nothing per slot.
+    """
+
+    def __init__(self, table: bytes | None = None):
+        self._data = bytearray([UNSET] * (ALARM_SLOTS_COUNT * SLOT_SIZE))
+        self._view = memoryview(self._data)
+        if table is not None:
+            size = min(len(table), len(self._data))
+            self._view[:size] = table[:size]
+
+    def __len__(self):
+        return ALARM_SLOTS_COUNT
+
+    def __getitem__(self, slot: int) -> Alarm:
+        if not 0 <= slot < ALARM_SLOTS_COUNT:
+            raise IndexError(f"Alarm slot {slot} out of range")
+        return Alarm(slot, self._view[slot * SLOT_SIZE:(slot + 1) * SLOT_SIZE])
+
+    def __iter__(self) -> Iterator[Alarm]:
+        for slot in range(ALARM_SLOTS_COUNT):
+            yield self[slot]
+
+    def write_page(self, slot_offset: int, page: bytes):
+        """Copy the slots of one 0x11 0x06 page, dropping padding past the last slot."""
+        start = slot_offset * SLOT_SIZE
+        size = min(SLOTS_PER_PAGE * SLOT_SIZE, len(self._data) - start)
+        if size > 0:
+            self._view[start:start + size] = page[:size]
+
+    def to_bytes(self) -> bytes:
+        """Snapshot of the table; comparing two is the change check."""
+        return bytes(self._data)
+
+    def changed_slots(self, previous: bytes | None) -> list[int]:
+        """Slots that differ from an earlier to_bytes() snapshot."""
+        if previous is None:
+            return list(range(ALARM_SLOTS_COUNT))
+        return [
+            slot for slot in range(ALARM_SLOTS_COUNT)
+            if self._view[slot * SLOT_SIZE:(slot + 1) * SLOT_SIZE]
+            != previous[slot * SLOT_SIZE:(slot + 1) * SLOT_SIZE]
+        ]
@@ -3,6 +3,22 @@ from enum import Enum
 
 CONFIGURATION_VALIDITY_TIME = timedelta(minutes=30)
 
+# Every field that can be written, by name
+CONFIGURATION_FIELDS = (
+    "sound_volume",
+    "timezone_offset",
+    "screen_light_time",
+    "daytime_brightness",
+    "nighttime_brightness",
+    "night_time_start_time",
+    "night_time_end_time",
+    "night_mode_enabled",
+    "language",
+    "use_24h_format",
+    "use_celsius",
+    "alarms_on",
+)
+
 
 class Language(Enum):
     EN = "en"
@@ -31,6 +47,11 @@ class Configuration:
         self._use_celsius = config_bytes[5] & 1 << 2 == 0
         self._alarms_on = config_bytes[5] & 1 << 4 == 0
 
+    def copy(self) -> "Configuration":
+        configuration = Configuration(self.to_bytes())
+        configuration.date = self.date
+        return configuration
+
     @property
     def is_expired(self):
         return self.date + CONFIGURATION_VALIDITY_TIME < datetime.now()
@@ -210,7 +231,7 @@ class Configuration:
         config_byte |= 0 if self.alarms_on else (1 << 4)
         byte_array.append(config_byte)
 
-        byte_array.append(self.timezone_offset // 6)
+        byte_array.append(self._timezone_offset // 6)
         byte_array.append(self.screen_light_time)
         byte_array.append(
             self._brightness_to_byte(self.daytime_brightness, self.nighttime_brightness)
@@ -0,0 +1,11 @@
+"""Protocol limits and timings of the CGD1, independent of any host application."""
+ALARM_SLOTS_COUNT = 19
+
+DISCONNECT_DELAY = 30
+SERVICE_DISCOVERY_DELAY = 2.0
+CONNECTION_TIMEOUT = 120
+CONNECT_RETRY_INTERVAL = 2
+READBACK_TIMEOUT = 10
+FRAME_HISTORY_SIZE = 50
+CONNECTION_HISTORY_SIZE = 20
+SAMPLE_RING_SIZE = 256
@@ -0,0 +1,96 @@
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import TypeVar
+
+from .exceptions import DeadlineExceededError
+
+_T = TypeVar("_T")
+
+_current: ContextVar["Deadline | None"] = ContextVar("qingping_deadline", default=None)
+
+
+class Deadline:
+    """A point in time by which a whole operation has to be done.
+
+    Every phase of the operation (connect, auth, write, readback) gets what is
+    left of it, capped by the phase's own timeout.
+    """
+
+    def __init__(self, seconds: float):
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(deadline: "Deadline | float | None"):
+    """Run the enclosed operations under deadline; an enclosing tighter deadline wins."""
+    if deadline is None:
+        yield
+        return
+
+    if not isinstance(deadline, Deadline):
+        deadline = Deadline(deadline)
+    outer = _current.get()
+    if outer is not None and outer.expires <= deadline.expires:
+        deadline = outer
+
+    token = _current.set(deadline)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def with_deadline(func):
+    """Let a coroutine method take a deadline= keyword that applies to everything it awaits."""
+    @functools.wraps(func)
+    async def wrapper(*args, deadline: "Deadline | float | None" = None, **kwargs):
+        with deadline_scope(deadline):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def detached_context() -> Context:
+    """A copy of the current context without the deadline, for work that outlives the operation."""
+    context = copy_context()
+    context.run(_current.set, None)
+    return context
+
+
+def check_deadline(phase: str):
+    deadline = _current.get()
+    if deadline is not None and deadline.remaining() <= 0:
+        raise DeadlineExceededError(phase)
+
+
+async def within(phase: str, awaitable: Awaitable[_T], timeout: float | None = None) -> _T:
+    """Await under the tighter of timeout and the current deadline.
+
+    Running out of the deadline raises DeadlineExceededError naming phase,
+    running out of timeout raises asyncio.TimeoutError as before.
+    """
+    deadline = _current.get()
+    if deadline is None:
+        if timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout)
+
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        if asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceededError(phase)
+
+    try:
+        return await asyncio.wait_for(awaitable, remaining if timeout is None else min(timeout, remaining))
+    except asyncio.TimeoutError:
+        if timeout is None or remaining <= timeout:
+            raise DeadlineExceededError(phase) from None
+        raise
@@ -1,5 +1,7 @@
 import asyncio
 
+from .deadline import detached_context
+
 class EventBus:
   def __init__(self):
     self.listeners = {}
@@ -18,4 +20,5 @@ class EventBus:
   def send(self, event_name, event_data=None):
     listeners = self.listeners.get(event_name, [])
     for listener in listeners:
-      asyncio.create_task(listener(event_data))
\ No newline at end of file
+      # A listener may start its own operations, which must not spend the sender's deadline
+      asyncio.create_task(listener(event_data), context=detached_context())
\ No newline at end of file
@@ -1,4 +1,6 @@
 DEVICE_CONNECT = "qingping_device_connected"
+DEVICE_READY = "qingping_device_ready"
 DEVICE_DISCONNECT = "qingping_device_disconnected"
 DEVICE_CONFIG_UPDATE = "qingping_device_configuration_updated"
-ALARMS_UPDATE = "qingping_alarms_updated"
\ No newline at end of file
+ALARMS_UPDATE = "qingping_alarms_updated"
+WRITES_UPDATE = "qingping_writes_counted"
\ No newline at end of file
@@ -1,9 +1,24 @@
-from homeassistant.exceptions import HomeAssistantError
+class QingpingError(Exception):
+    """Base of every error raised by the protocol library."""
 
 
-class NotConnectedError(HomeAssistantError):
+class NotConnectedError(QingpingError):
     pass
 
 
-class NoConfigurationError(HomeAssistantError):
+class NoConfigurationError(QingpingError):
     pass
+
+
+class AlarmNotConfiguredError(QingpingError, ValueError):
+    pass
+
+
+class InvalidStateTransitionError(QingpingError):
+    pass
+
+
+class DeadlineExceededError(QingpingError):
+    def __init__(self, phase: str):
+        super().__init__(f"Deadline exceeded while {phase}")
+        self.phase = phase
@@ -0,0 +1,62 @@
+XIAOMI_SERVICE_UUID = "0000fe95-0000-1000-8000-00805f9b34fb"
+CGD1_PRODUCT_ID = 0x0576
+
+# Frame control bits
+FLAG_ENCRYPTED = 1 << 3
+FLAG_MAC = 1 << 4
+FLAG_CAPABILITY = 1 << 5
+FLAG_OBJECTS = 1 << 6
+CAPABILITY_IO = 1 << 5
+
+OBJECT_TEMPERATURE = 0x1004
+OBJECT_HUMIDITY = 0x1006
+OBJECT_TEMPERATURE_HUMIDITY = 0x100D
+
+
+class MiBeacon:
+    __slots__ = ("product_id", "counter", "temperature", "humidity")
+
+    def __init__(self, product_id: int, counter: int):
+        self.product_id = product_id
+        self.counter = counter
+        self.temperature: float | None = None
+        self.humidity: float | None = None
+
+
+def parse_mibeacon(data: bytes) -> MiBeacon | None:
+    """Decode the FE95 service data of a clock. Encrypted beacons are not supported."""
+    if len(data) < 5:
+        return None
+
+    frame_control = int.from_bytes(data[0:2], "little")
+    beacon = MiBeacon(int.from_bytes(data[2:4], "little"), data[4])
+    if frame_control & FLAG_ENCRYPTED or not frame_control & FLAG_OBJECTS:
+        return beacon
+
+    offset = 5
+    if frame_control & FLAG_MAC:
+        offset += 6
+    if frame_control & FLAG_CAPABILITY:
+        if offset >= len(data):
+            return beacon
+        if data[offset] & CAPABILITY_IO:
+            offset += 2
+        offset += 1
+
+    while offset + 3 <= len(data):
+        object_type = int.from_bytes(data[offset:offset + 2], "little")
+        length = data[offset + 2]
+        value = data[offset + 3:offset + 3 + length]
+        if len(value) < length:
+            break
+        offset += 3 + length
+
+        if object_type == OBJECT_TEMPERATURE and length == 2:
+            beacon.temperature = int.from_bytes(value, "little", signed=True) / 10
+        elif object_type == OBJECT_HUMIDITY and length == 2:
+            beacon.humidity = int.from_bytes(value, "little") / 10
+        elif object_type == OBJECT_TEMPERATURE_HUMIDITY and length == 4:
+            beacon.temperature = int.from_bytes(value[0:2], "little", signed=True) / 10
+            beacon.humidity = int.from_bytes(value[2:4], "little") / 10
+
+    return beacon
@@ -0,0 +1,30 @@
+import base64
+import binascii
+
+from .alarm_table import AlarmTable, SLOT_SIZE
+from .configuration import Configuration
+from .const import ALARM_SLOTS_COUNT
+
+PROFILE_VERSION = 1
+CONFIGURATION_SIZE = 20
+PROFILE_SIZE = 1 + CONFIGURATION_SIZE + ALARM_SLOTS_COUNT * SLOT_SIZE
+
+
+def encode_profile(configuration: Configuration, alarms: AlarmTable) -> str:
+    """A version byte, the raw configuration frame and the alarm table, in base64."""
+    return base64.b64encode(
+        bytes([PROFILE_VERSION]) + configuration.to_bytes() + alarms.to_bytes()
+    ).decode()
+
+
+def decode_profile(profile: str) -> tuple[Configuration, AlarmTable]:
+    try:
+        data = base64.b64decode(profile, validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Profile is not valid base64: {e}")
+
+    if len(data) != PROFILE_SIZE or data[0] != PROFILE_VERSION:
+        raise ValueError("Unsupported or truncated profile.")
+
+    configuration = Configuration(data[1:1 + CONFIGURATION_SIZE])
+    return configuration, AlarmTable(data[1 + CONFIGURATION_SIZE:])
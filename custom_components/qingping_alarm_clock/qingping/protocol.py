@@ -0,0 +1,55 @@
+from collections.abc import Iterator
+
+MAIN_CHAR       = "00000001-0000-1000-8000-00805f9b34fb"
+CFG_WRITE_CHAR  = "0000000B-0000-1000-8000-00805f9b34fb"
+CFG_READ_CHAR   = "0000000C-0000-1000-8000-00805f9b34fb"
+
+AUTH_STEP_1 = bytes.fromhex("1101ea600e964287ea7d17894900da6174bd")
+AUTH_STEP_2 = bytes.fromhex("1102ea600e964287ea7d17894900da6174bd")
+
+OPCODE_CONFIGURATION = b"\x13\x02"
+OPCODE_ALARMS = b"\x11\x06"
+
+# Full length of each response frame, opcode included
+FRAME_LENGTHS = {
+    OPCODE_CONFIGURATION: 20,
+    OPCODE_ALARMS: 18,
+}
+
+
+class FrameReassembler:
+    """Joins response frames that arrive split over several notifications.
+
+    Frames of unknown opcodes are passed through as they arrive, since their
+    length is not known.
+    """
+
+    def __init__(self, frame_lengths: dict[bytes, int] = FRAME_LENGTHS):
+        self._frame_lengths = frame_lengths
+        self._buffer = bytearray()
+        self.dropped_bytes = 0
+
+    def reset(self):
+        self.dropped_bytes += len(self._buffer)
+        self._buffer.clear()
+
+    def feed(self, data: bytes) -> Iterator[bytes]:
+        # A complete frame after a partial one means the rest of that one was lost
+        length = self._frame_lengths.get(bytes(data[:2]))
+        if self._buffer and length is not None and len(data) >= length:
+            self.reset()
+
+        self._buffer += data
+        while len(self._buffer) >= 2:
+            length = self._frame_lengths.get(bytes(self._buffer[:2]))
+            if length is None:
+                frame = bytes(self._buffer)
+                self._buffer.clear()
+                yield frame
+                return
+            if len(self._buffer) < length:
+                return
+
+            frame = bytes(self._buffer[:length])
+            del self._buffer[:length]
+            yield frame
@@ -1,136 +1,257 @@
 import asyncio
 import logging
 import time
-from bleak import BleakClient
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from typing import Any
 from datetime import time as dtime
 
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ServiceValidationError
-from homeassistant.components.bluetooth import (
-    async_ble_device_from_address
-)
-
-from .configuration import Configuration, Language
-from .util import updates_configuration
+from .configuration import Configuration, Language, CONFIGURATION_VALIDITY_TIME
 from .alarm import Alarm, AlarmDay
+from .alarm_table import AlarmTable
 from .eventbus import EventBus
-from .exceptions import NotConnectedError
-from ..const import (
+from .exceptions import NotConnectedError, AlarmNotConfiguredError, DeadlineExceededError
+from .protocol import (
+    FrameReassembler,
+    OPCODE_CONFIGURATION,
+    OPCODE_ALARMS,
+    MAIN_CHAR,
+    CFG_WRITE_CHAR,
+    CFG_READ_CHAR,
+    AUTH_STEP_1,
+    AUTH_STEP_2
+)
+from .state import ConnectionState, ConnectionStateMachine
+from .deadline import check_deadline, with_deadline, within
+from .transport import Client, ClientFactory, Resolver, bleak_client
+from .const import (
     ALARM_SLOTS_COUNT,
     DISCONNECT_DELAY,
-    CONNECTION_TIMEOUT
+    SERVICE_DISCOVERY_DELAY,
+    CONNECTION_TIMEOUT,
+    READBACK_TIMEOUT,
+    CONNECT_RETRY_INTERVAL,
+    FRAME_HISTORY_SIZE,
+    CONNECTION_HISTORY_SIZE
 )
 from .events import (
     DEVICE_CONNECT,
+    DEVICE_READY,
     DEVICE_DISCONNECT,
     DEVICE_CONFIG_UPDATE,
-    ALARMS_UPDATE
+    ALARMS_UPDATE,
+    WRITES_UPDATE
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-MAIN_CHAR       = "00000001-0000-1000-8000-00805f9b34fb"
-CFG_WRITE_CHAR  = "0000000B-0000-1000-8000-00805f9b34fb"
-CFG_READ_CHAR   = "0000000C-0000-1000-8000-00805f9b34fb"
-
-AUTH_STEP_1 = bytes.fromhex("1101ea600e964287ea7d17894900da6174bd")
-AUTH_STEP_2 = bytes.fromhex("1102ea600e964287ea7d17894900da6174bd")
-
 
 class Qingping:
     client = None
     configuration = None
-    alarms: list[Alarm] = []
-    eventbus = EventBus()
 
-    _connect_lock = asyncio.Lock()
-    _configuration_event = asyncio.Event()
-    _alarms_event = asyncio.Event()
-    _disconnect_task = None
+    _disconnect_task: asyncio.Task | None = None
+    _syncing_task: asyncio.Task | None = None
 
-    def __init__(self, hass: HomeAssistant, mac: str, name: str):
-        """Initialize the Qingping CGD1 Alarm Clock."""
-        self.hass = hass
+    def __init__(
+        self,
+        mac: str,
+        name: str,
+        resolver: Resolver,
+        client_factory: ClientFactory = bleak_client,
+        discovery_delay: float = SERVICE_DISCOVERY_DELAY
+    ):
+        """Initialize the Qingping CGD1 Alarm Clock.
+
+        resolver lists the paths that currently reach mac and client_factory
+        builds a client for one of them; the host application provides both.
+        """
         self.mac = mac
         self.name = name
-
-    async def connect(self) -> bool:
+        self._resolver = resolver
+        self._client_factory = client_factory
+        self._discovery_delay = discovery_delay
+        self.eventbus = EventBus()
+        self.counters = Counter()
+        # Bounded, so diagnostics cost the same per clock however long it runs
+        self.frames: deque[tuple[float, str, bytes]] = deque(maxlen=FRAME_HISTORY_SIZE)
+        self.state = ConnectionStateMachine(CONNECTION_HISTORY_SIZE)
+        self.alarms = AlarmTable()
+        self.alarms_date: datetime | None = None
+
+        self._connect_lock = asyncio.Lock()
+        self._configuration_event = asyncio.Event()
+        self._alarms_event = asyncio.Event()
+        self._disconnected = asyncio.Event()
+
+        self._read_handle: int | None = None
+        self._reassembler = FrameReassembler()
+        self._frame_handlers = {
+            OPCODE_CONFIGURATION: self._handle_configuration_frame,
+            OPCODE_ALARMS: self._handle_alarms_frame,
+        }
+
+    def restore(
+        self,
+        configuration: tuple[bytes, datetime] | None,
+        alarms: tuple[bytes, datetime] | None
+    ):
+        """Seed the caches with frames saved by a previous run, without connecting."""
+        if configuration is not None:
+            frame, date = configuration
+            self.configuration = Configuration(frame)
+            self.configuration.date = date
+            self.eventbus.send(DEVICE_CONFIG_UPDATE, self.configuration)
+
+        if alarms is not None:
+            table, date = alarms
+            self.alarms = AlarmTable(table)
+            self.alarms_date = date
+            self.eventbus.send(ALARMS_UPDATE, self.alarms)
+
+    @with_deadline
+    async def connect(self, read_state: bool = True) -> bool:
         async with self._connect_lock:
-            if self.client and self.client.is_connected:
+            if self.state.state in (ConnectionState.READY, ConnectionState.LINGERING):
                 return True
-
-            device = async_ble_device_from_address(self.hass, self.mac, connectable=True)
-            self.client = BleakClient(device, disconnected_callback=self._on_disconnect)
+            if self.state.state is ConnectionState.DISCONNECTING:
+                await self._disconnected.wait()
 
             _LOGGER.debug(f"Connecting to {self.mac}...")
+            self.state.transition(ConnectionState.CONNECTING)
             try:
-                await self.client.connect()
-            except Exception as e:
-                _LOGGER.debug(f"Failed to connect to {self.mac}: {e}")
-                return False
-
-            await asyncio.sleep(2.0)  # give some time for service discovery
-
-            _LOGGER.debug(f"Connected to {self.mac}, authenticating...")
-
-            # Step 1 auth
-            await self._write_gatt_char(MAIN_CHAR, AUTH_STEP_1)
-
-            # Step 2 auth
-            await self._write_gatt_char(MAIN_CHAR, AUTH_STEP_2)
-
-            self.eventbus.send(DEVICE_CONNECT, self)
-
-            # Read configuration
-            _LOGGER.debug("Reading configuration...")
-            await self.client.start_notify(CFG_READ_CHAR, self._notification_handler)
-            await self.get_configuration()
-
-            # Read alarms
-            _LOGGER.debug("Reading alarms...")
-            await self.get_alarms()
-
+                client = self.client = await self._connect_path()
+                if client is None:
+                    self.counters["connect_failures"] += 1
+                    self.state.transition(ConnectionState.IDLE)
+                    return False
+
+                self.counters["connects"] += 1
+                self.state.transition(ConnectionState.DISCOVERING)
+                await within("discovering", asyncio.sleep(self._discovery_delay))  # give some time for service discovery
+                self._check_link(client, "discovering")
+
+                _LOGGER.debug(f"Connected to {self.mac}, authenticating...")
+                self.state.transition(ConnectionState.AUTHENTICATING)
+                try:
+                    # Step 1 auth
+                    await self._write_gatt_char(MAIN_CHAR, AUTH_STEP_1, "authenticating")
+
+                    # Step 2 auth
+                    await self._write_gatt_char(MAIN_CHAR, AUTH_STEP_2, "authenticating")
+                except Exception:
+                    self.counters["auth_failures"] += 1
+                    raise
+                self._check_link(client, "authenticating")
+
+                self.eventbus.send(DEVICE_CONNECT, self)
+
+                if read_state:
+                    self.state.transition(ConnectionState.SYNCING)
+                    self._syncing_task = asyncio.current_task()
+
+                    # Read configuration
+                    _LOGGER.debug("Reading configuration...")
+                    self._read_handle = client.services.get_characteristic(CFG_READ_CHAR).handle
+                    self._reassembler.reset()
+                    await within(
+                        "syncing", client.start_notify(self._read_handle, self._notification_handler)
+                    )
+                    await self.get_configuration()
+
+                    # Read alarms
+                    _LOGGER.debug("Reading alarms...")
+                    await self.get_alarms()
+                    self._check_link(client, "syncing")
+
+                self.state.transition(ConnectionState.READY)
+                self.eventbus.send(DEVICE_READY, self)
+            except BaseException:
+                # Cancelled or failed, never leave a half set up link or a stuck state behind
+                await self._abort_connect()
+                raise
+            finally:
+                self._syncing_task = None
+
+            self._linger()
             return True
 
+    @with_deadline
+    async def probe(self) -> bool:
+        """Connect and authenticate once without reading any state."""
+        try:
+            return await self.connect(read_state=False)
+        finally:
+            await self.disconnect()
+
+    @with_deadline
     async def connect_if_needed(self) -> bool:
         if not self.configuration or self.configuration.is_expired:
             return await self.connect()
 
         return False
 
+    @with_deadline
     async def disconnect(self) -> bool:
-        if self.client and self.client.is_connected:
-            _LOGGER.debug(f"Disconnecting from {self.mac}...")
-            await self.client.disconnect()
-            return True
-
-        return False
+        client = self.client
+        if client is None or not self.state.is_connected:
+            return False
+
+        self._cancel_linger()
+        _LOGGER.debug(f"Disconnecting from {self.mac}...")
+        self.state.transition(ConnectionState.DISCONNECTING)
+        self._disconnected.clear()
+        try:
+            await client.disconnect()
+        finally:
+            # Normally done by the disconnect callback already
+            self._on_disconnect(client)
+        return True
 
     async def delayed_disconnect(self):
-        if not self.client.is_connected:
-            return
+        await asyncio.sleep(DISCONNECT_DELAY)
+        self._disconnect_task = None  # so disconnect() does not cancel this task
 
         try:
-            await asyncio.sleep(DISCONNECT_DELAY)
             await self.disconnect()
-            if self._disconnect_task:
-                self._disconnect_task.cancel()
-                self._disconnect_task = None
             _LOGGER.debug(f"Disconnected from {self.mac}")
         except Exception as e:
             _LOGGER.debug(f"Failed to disconnect. Error: {e}")
 
+    @with_deadline
     async def get_configuration(self):
-        if self.client and self.client.is_connected:
-            await self._write_config(b"\x01\x02")
-            await self._configuration_event.wait()
-        else:
-            raise NotConnectedError("Not connected")
+        self._check_ready()
+        self._configuration_event.clear()
+        await self._write_config(b"\x01\x02")
+        await self._wait_for_readback(self._configuration_event)
 
+    @with_deadline
+    async def read_configuration(self, max_age: timedelta):
+        """Read the configuration unless the cached one is younger than max_age."""
+        if self._is_younger(self.configuration and self.configuration.date, max_age):
+            return
+
+        await self._ensure_connected()
+        # A new connection has read it already
+        if not self._is_younger(self.configuration and self.configuration.date, max_age):
+            await self.get_configuration()
+
+    @with_deadline
+    async def read_alarms(self, max_age: timedelta):
+        """Read the alarm table unless the cached one is younger than max_age."""
+        if self._is_younger(self.alarms_date, max_age):
+            return
+
+        await self._ensure_connected()
+        if not self._is_younger(self.alarms_date, max_age):
+            await self.get_alarms()
+
+    @with_deadline
     async def set_configuration(self, configuration: Configuration):
         await self._write_config(configuration.to_bytes())
         await self._write_config(b"\x01\x02")
 
+    @with_deadline
     async def set_time(self, timestamp: int, timezone_offset: int | None = None):
         start_time = time.time()
 
@@ -141,21 +262,20 @@ class Qingping:
         timestamp = int(timestamp + (time.time() - start_time))
 
         timestamp_bytes = self._get_timestamp_bytes(timestamp)
+        self._check_ready()
         await self._write_gatt_char(MAIN_CHAR, timestamp_bytes)
 
-        if timezone_offset is not None and \
-            self.configuration.timezone_offset != timezone_offset:
-
-            self.configuration.timezone_offset = timezone_offset
-            await self.set_configuration(self.configuration)
+        if timezone_offset is not None:
+            await self.update_configuration({"timezone_offset": timezone_offset})
 
+    @with_deadline
     async def get_alarms(self):
-        if self.client and self.client.is_connected:
-            await self._write_config(b"\x01\x06")
-            await self._alarms_event.wait()
-        else:
-            raise NotConnectedError("Not connected")
+        self._check_ready()
+        self._alarms_event.clear()
+        await self._write_config(b"\x01\x06")
+        await self._wait_for_readback(self._alarms_event)
 
+    @with_deadline
     async def set_alarm(
         self,
         slot: int,
@@ -163,135 +283,286 @@ class Qingping:
         time: dtime | None,
         days: set[AlarmDay] | None
     ) -> bool:
-        await self._ensure_alarms()
-        await self._ensure_connected()
-
         if slot >= 0 and slot < ALARM_SLOTS_COUNT:
-            alarm: Alarm = self.alarms[slot]
+            change = {}
             if is_enabled is not None:
-                alarm.is_enabled = is_enabled
+                change["enabled"] = is_enabled
             if time is not None:
-                alarm.time = time
+                change["time"] = time
             if days is not None:
-                alarm.days = days
-
-            if not alarm.is_configured:
-                raise ServiceValidationError("Alarm not configured.")
+                change["days"] = days
 
-            await self._write_config(alarm.to_bytes())
-            await self.get_alarms()
+            await self.update_alarms({slot: change})
             return True
 
         return False
 
+    @with_deadline
     async def delete_alarm(self, slot: int) -> bool:
-        await self._ensure_alarms()
-        await self._ensure_connected()
-
         if slot >= 0 and slot < ALARM_SLOTS_COUNT:
-            alarm: Alarm = self.alarms[slot]
-            alarm.deactivate()
+            await self.update_alarms({slot: {"reset": True}})
+            return True
+
+        return False
+
+    @with_deadline
+    async def update_alarms(self, changes: dict[int, dict]) -> bool:
+        """Write several alarm slots in one session followed by a single readback.
 
-            if self.client and self.client.is_connected:
-                await self._write_config(alarm.to_bytes())
+        Each change may contain "enabled", "time" and "days" to update the slot
+        and "reset" to clear the slot before applying them. Slots that already
+        hold the requested alarm are not written, and when none is left the
+        clock is not contacted at all. Returns whether anything was written.
+        """
+        if not self.alarms_are_fresh:
+            await self._ensure_connected()
+            # A connect made just now has read them already
+            if not self.alarms_are_fresh:
                 await self.get_alarms()
-                return True
-            else:
-                raise NotConnectedError("Not connected")
 
-    @updates_configuration
+        alarms = [
+            alarm for alarm in self._apply_alarm_changes(changes)
+            if alarm.to_bytes() != self.alarms[alarm.slot].to_bytes()
+        ]
+        self._count_writes(skipped=len(changes) - len(alarms))
+        if not alarms:
+            _LOGGER.debug(f"Alarms of {self.mac} already up to date, skipping write")
+            return False
+
+        await self._ensure_connected()
+        for alarm in alarms:
+            await self._write_config(alarm.to_bytes())
+        self._count_writes(performed=len(alarms))
+        await self.get_alarms()
+        return True
+
+    @with_deadline
+    async def update_configuration(
+        self,
+        changes: dict[str, Any],
+        extra_frames: list[bytes] | None = None
+    ) -> bool:
+        """Apply several configuration fields with a single write.
+
+        The write is skipped without connecting when the cached configuration
+        is fresh and already matches. extra_frames are sent after the
+        configuration, e.g. to preview a new volume or brightness. Returns
+        whether anything was written.
+        """
+        if self.is_noop_configuration(changes):
+            self._count_writes(skipped=1)
+            _LOGGER.debug(f"Configuration of {self.mac} already up to date, skipping write")
+            return False
+
+        await self._ensure_connected()
+        await self._ensure_configuration()
+
+        configuration = self._apply_configuration_changes(changes)
+        if configuration.to_bytes() == self.configuration.to_bytes():
+            self._count_writes(skipped=1)
+            return False
+
+        await self._write_config(configuration.to_bytes())
+        for frame in extra_frames or []:
+            await self._write_config(frame)
+        self._count_writes(performed=1)
+        await self.get_configuration()
+        return True
+
+    def _count_writes(self, performed: int = 0, skipped: int = 0):
+        # A skipped write never connects, so the counters get an event of their own
+        self.counters["writes_performed"] += performed
+        self.counters["writes_skipped"] += skipped
+        self.eventbus.send(WRITES_UPDATE, self.counters)
+
+    def is_noop_configuration(self, changes: dict[str, Any]) -> bool:
+        """Whether the fresh cached configuration already holds these values."""
+        if not self.configuration_is_fresh:
+            return False
+        configuration = self._apply_configuration_changes(changes)
+        return configuration.to_bytes() == self.configuration.to_bytes()
+
+    def is_noop_alarms(self, changes: dict[int, dict]) -> bool:
+        """Whether the fresh cached alarm table already holds these alarms."""
+        if not self.alarms_are_fresh:
+            return False
+        try:
+            alarms = self._apply_alarm_changes(changes)
+        except AlarmNotConfiguredError:
+            return False
+        return all(alarm.to_bytes() == self.alarms[alarm.slot].to_bytes() for alarm in alarms)
+
+    @property
+    def configuration_is_fresh(self) -> bool:
+        return self.configuration is not None and not self.configuration.is_expired
+
+    @property
+    def alarms_are_fresh(self) -> bool:
+        return self.alarms_date is not None and \
+            self.alarms_date + CONFIGURATION_VALIDITY_TIME > datetime.now()
+
+    @with_deadline
     async def enable_alarms(self, is_enabled: bool):
-        self.configuration.alarms_on = is_enabled
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"alarms_on": is_enabled})
 
-    @updates_configuration
+    @with_deadline
     async def set_sound_volume(self, volume: int):
-        self.configuration.sound_volume = volume
-        await self._write_config(self.configuration.to_bytes())
-        await self._write_config(b"\x01\x04")
+        await self.update_configuration({"sound_volume": volume}, [b"\x01\x04"])
 
-    @updates_configuration
+    @with_deadline
     async def set_screen_light_time(self, _time: int):
-        self.configuration.screen_light_time = _time
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"screen_light_time": _time})
 
-    @updates_configuration
+    @with_deadline
     async def set_daytime_brightness(self, brightness: int):
-        self.configuration.daytime_brightness = brightness
-        await self._write_config(self.configuration.to_bytes())
-        await self._write_config(bytes([0x02, 0x03, brightness//10]))
+        await self.update_configuration(
+            {"daytime_brightness": brightness},
+            [bytes([0x02, 0x03, brightness//10])]
+        )
 
-    @updates_configuration
+    @with_deadline
     async def set_nighttime_brightness(self, brightness: int):
-        self.configuration.nighttime_brightness = brightness
-        await self._write_config(self.configuration.to_bytes())
-        await self._write_config(bytes([0x02, 0x03, brightness//10]))
+        await self.update_configuration(
+            {"nighttime_brightness": brightness},
+            [bytes([0x02, 0x03, brightness//10])]
+        )
 
-    @updates_configuration
+    @with_deadline
     async def set_nighttime_start_time(self, _time: dtime):
-        self.configuration.night_time_start_time = _time
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"night_time_start_time": _time})
 
-    @updates_configuration
+    @with_deadline
     async def set_nighttime_end_time(self, _time: dtime):
-        self.configuration.night_time_end_time = _time
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"night_time_end_time": _time})
 
-    @updates_configuration
+    @with_deadline
     async def set_night_mode(self, is_night_mode: bool):
-        self.configuration.night_mode_enabled = is_night_mode
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"night_mode_enabled": is_night_mode})
 
-    @updates_configuration
+    @with_deadline
     async def set_language(self, language: Language):
-        self.configuration.language = language
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"language": language})
 
-    @updates_configuration
+    @with_deadline
     async def set_24h_time_format(self, is_24h: bool):
-        self.configuration.use_24h_format = is_24h
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"use_24h_format": is_24h})
 
-    @updates_configuration
+    @with_deadline
     async def set_uses_celsius(self, is_celsius: bool):
-        self.configuration.use_celsius = is_celsius
-        await self._write_config(self.configuration.to_bytes())
+        await self.update_configuration({"use_celsius": is_celsius})
+
+    def _apply_configuration_changes(self, changes: dict[str, Any]) -> Configuration:
+        configuration = self.configuration.copy()
+        # Enabling night mode resets the night window, so it has to go first
+        for field in sorted(changes, key=lambda field: field != "night_mode_enabled"):
+            setattr(configuration, field, changes[field])
+        return configuration
+
+    def _apply_alarm_changes(self, changes: dict[int, dict]) -> list[Alarm]:
+        alarms = []
+        for slot, change in changes.items():
+            alarm = self.alarms[slot].copy()
+            if change.get("reset"):
+                alarm.deactivate()
+            if change.get("enabled") is not None:
+                alarm.is_enabled = change["enabled"]
+            if change.get("time") is not None:
+                alarm.time = change["time"]
+            if change.get("days") is not None:
+                alarm.days = change["days"]
+
+            # Only a plain reset may leave the slot empty
+            if not alarm.is_configured and change.keys() != {"reset"}:
+                raise AlarmNotConfiguredError("Alarm not configured.")
+            alarms.append(alarm)
+
+        return alarms
+
+    @staticmethod
+    def _is_younger(date: datetime | None, max_age: timedelta) -> bool:
+        return date is not None and datetime.now() - date <= max_age
 
     async def _ensure_connected(self):
         async def wait_for_connected():
-            while not self.client or not self.client.is_connected:
-                await self.connect()
+            # connect() returns at once when ready, and waits out one running in another task
+            while True:
+                check_deadline("connecting")
+                if await self.connect():
+                    return
+                await within("connecting", asyncio.sleep(CONNECT_RETRY_INTERVAL))
 
         try:
             await asyncio.wait_for(wait_for_connected(), CONNECTION_TIMEOUT)
         except asyncio.TimeoutError:
+            self.counters["connect_timeouts"] += 1
             raise NotConnectedError("Connection timeout")
 
     async def _ensure_configuration(self):
-        if not self.configuration or self.configuration.is_expired:
+        if not self.configuration_is_fresh:
             await self._ensure_connected()
-            await self.get_configuration()
+            # A connect made just now has read it already
+            if not self.configuration_is_fresh:
+                await self.get_configuration()
 
-    async def _ensure_alarms(self):
-        if not self.alarms:
-            await self._ensure_connected()
-            await self.get_alarms()
+    async def _wait_for_readback(self, event: asyncio.Event):
+        try:
+            await within("reading back", event.wait(), READBACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.counters["readback_timeouts"] += 1
+            raise NotConnectedError("Readback timeout")
+        self.counters["readbacks"] += 1
 
     async def _write_config(self, data: bytes):
-        if self.client and self.client.is_connected:
-            await self._write_gatt_char(CFG_WRITE_CHAR, data)
+        self._check_ready()
+        if self.state.state is ConnectionState.LINGERING:
+            self.state.transition(ConnectionState.READY)
+        self.frames.append((time.time(), ">>", bytes(data)))
+        await self._write_gatt_char(CFG_WRITE_CHAR, data)
+
+        # While syncing, connect() starts lingering once it is done
+        if self.state.state is ConnectionState.READY:
+            self._linger()
+
+    def _check_ready(self):
+        """Only a set up link takes configuration frames; connect() itself may read while syncing."""
+        state = self.state.state
+        if state in (ConnectionState.READY, ConnectionState.LINGERING):
+            return
+        if state is ConnectionState.SYNCING and asyncio.current_task() is self._syncing_task:
+            return
+        raise NotConnectedError(f"Not connected ({state.value})")
 
-            loop = asyncio.get_running_loop()
-            if self._disconnect_task is not None:
-                self._disconnect_task.cancel()
-            self._disconnect_task = loop.create_task(self.delayed_disconnect())
-        else:
-            raise NotConnectedError("Not connected")
+    def _check_link(self, client: Client, phase: str):
+        """Raise NotConnectedError if the link dropped while connect() was awaiting."""
+        if self.client is not client or not self.state.is_connected:
+            raise NotConnectedError(f"Disconnected while {phase}")
 
-    async def _write_gatt_char(self, uuid: str, data: bytes):
+    async def _abort_connect(self):
+        if self.state.is_connected:
+            try:
+                await self.disconnect()
+            except Exception as e:
+                _LOGGER.debug(f"Failed to disconnect. Error: {e}")
+        elif self.state.state is not ConnectionState.IDLE:
+            self.state.transition(ConnectionState.IDLE)
+
+    def _linger(self):
+        """Keep the link open for DISCONNECT_DELAY in case another operation follows."""
+        self._cancel_linger()
+        if self.state.state is ConnectionState.READY:
+            self.state.transition(ConnectionState.LINGERING)
+        self._disconnect_task = asyncio.get_running_loop().create_task(self.delayed_disconnect())
+
+    def _cancel_linger(self):
+        if self._disconnect_task is not None:
+            self._disconnect_task.cancel()
+            self._disconnect_task = None
+
+    async def _write_gatt_char(self, uuid: str, data: bytes, phase: str = "writing"):
         if self.client and self.client.is_connected:
             _LOGGER.debug(f">> {uuid}: {data.hex()}")
-            await self.client.write_gatt_char(uuid, data)
+            self.counters["bytes_sent"] += len(data)
+            await within(phase, self.client.write_gatt_char(uuid, data))
         else:
             raise NotConnectedError("Not connected")
 
@@ -306,32 +577,67 @@ class Qingping:
 
         return bytes(timestamp_bytes)
 
-    async def _notification_handler(self, sender, data):
-        if sender.uuid.lower() == CFG_READ_CHAR.lower():
-            _LOGGER.debug(f"<< {sender.uuid}: {data.hex()}")
-            if data.startswith(b"\x13\x02"):
-                _LOGGER.debug(f"Got configuration bytes: {data.hex()}")
-                self.configuration = Configuration(data)
-
-                self._configuration_event.set()
-                self.eventbus.send(DEVICE_CONFIG_UPDATE, self.configuration)
-            elif data.startswith(b"\x11\x06") and len(data) == 18:
-                _LOGGER.debug(f"Got alarms bytes: {data.hex()}")
-                slot_offset = data[2]
-                if slot_offset == 0:
-                    self.alarms = []
-
-                self.alarms.append(Alarm(slot_offset, data[3:8]))
-                self.alarms.append(Alarm(slot_offset + 1, data[8:13]))
-                self.alarms.append(Alarm(slot_offset + 2, data[13:18]))
-
-                self._alarms_event.set()
-                self.eventbus.send(ALARMS_UPDATE, self.alarms)
-
-    def _on_disconnect(self, client: BleakClient):
-        if self._disconnect_task is not None:
-            self._disconnect_task.cancel()
-            self._disconnect_task = None
+    def _notification_handler(self, sender, data: bytearray):
+        if sender.handle != self._read_handle:
+            return
+
+        _LOGGER.debug(f"<< {sender.uuid}: {data.hex()}")
+        self.counters["bytes_received"] += len(data)
+        self.frames.append((time.time(), "<<", bytes(data)))
+        for frame in self._reassembler.feed(data):
+            handler = self._frame_handlers.get(frame[:2])
+            if handler is None:
+                self.counters["unknown_frames"] += 1
+                _LOGGER.debug(f"Ignoring frame with unknown opcode: {frame.hex()}")
+                continue
+            handler(frame)
+
+    def _handle_configuration_frame(self, frame: bytes):
+        self.configuration = Configuration(frame)
+
+        self._configuration_event.set()
+        self.eventbus.send(DEVICE_CONFIG_UPDATE, self.configuration)
+
+    def _handle_alarms_frame(self, frame: bytes):
+        slot_offset = frame[2]
+        self.alarms.write_page(slot_offset, frame[3:18])
+
+        # The table is only complete once its last page arrived
+        if slot_offset + 3 >= ALARM_SLOTS_COUNT:
+            self.alarms_date = datetime.now()
+            self._alarms_event.set()
+        self.eventbus.send(ALARMS_UPDATE, self.alarms)
+
+    async def _connect_path(self) -> Client | None:
+        """Connect over the first path that reaches the clock.
+
+        Within Home Assistant the Bluetooth stack picks the adapter or proxy
+        itself, whatever path it is handed.
+        """
+        paths = self._resolver(self.mac)
+        if not paths:
+            _LOGGER.debug(f"No connectable path to {self.mac}")
+            return None
+
+        path = paths[0]
+        client = self._client_factory(path.device, self._on_disconnect)
+        try:
+            await within("connecting", client.connect())
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            _LOGGER.debug(f"Failed to connect to {self.mac} via {path.source}: {e}")
+            return None
+
+        _LOGGER.debug(f"Connected to {self.mac} via {path.source}")
+        return client
+
+    def _on_disconnect(self, client: Client):
+        if client is not self.client:
+            return  # a client that is no longer current, or already handled
 
+        self._cancel_linger()
         self.client = None
+        self.state.transition(ConnectionState.IDLE)
+        self._disconnected.set()
         self.eventbus.send(DEVICE_DISCONNECT, self)
@@ -0,0 +1,96 @@
+from collections import deque
+
+
+class SampleWindow:
+    """Min, max and mean over the samples of the last window seconds.
+
+    Samples live in a fixed-size ring, so the oldest ones also drop out once
+    capacity samples are held. Adding a sample is amortized O(1): the sum is
+    kept running, and min and max come from monotonic queues of sample
+    numbers.
+    """
+
+    def __init__(self, window: float, capacity: int):
+        self.window = window
+        self._times = [0.0] * capacity
+        self._values = [0.0] * capacity
+        self._first = 0  # number of the oldest sample held
+        self._next = 0  # number the next sample gets
+        self._sum = 0.0
+        self._min: deque[int] = deque()
+        self._max: deque[int] = deque()
+
+    def __len__(self):
+        return self._next - self._first
+
+    def add(self, moment: float, value: float):
+        capacity = len(self._values)
+        while len(self) and (len(self) == capacity or self._times[self._first % capacity] <= moment - self.window):
+            self._evict()
+
+        number = self._next
+        self._next += 1
+        self._times[number % capacity] = moment
+        self._values[number % capacity] = value
+        self._sum += value
+
+        while self._min and self._values[self._min[-1] % capacity] >= value:
+            self._min.pop()
+        self._min.append(number)
+        while self._max and self._values[self._max[-1] % capacity] <= value:
+            self._max.pop()
+        self._max.append(number)
+
+    @property
+    def min(self) -> float | None:
+        return self._values[self._min[0] % len(self._values)] if self._min else None
+
+    @property
+    def max(self) -> float | None:
+        return self._values[self._max[0] % len(self._values)] if self._max else None
+
+    @property
+    def mean(self) -> float | None:
+        return self._sum / len(self) if len(self) else None
+
+    def _evict(self):
+        number = self._first
+        self._first += 1
+        self._sum -= self._values[number % len(self._values)]
+        if self._min and self._min[0] == number:
+            self._min.popleft()
+        if self._max and self._max[0] == number:
+            self._max.popleft()
+
+
+class SampledValue:
+    """Decides when a fast-changing reading is worth publishing.
+
+    A value is published once per window, as the window mean, and straight
+    away when a sample moves further than threshold from the last published
+    value.
+    """
+
+    def __init__(self, window: float, threshold: float, capacity: int):
+        self.threshold = threshold
+        self.samples = SampleWindow(window, capacity)
+        self.value: float | None = None
+        self._published_at: float | None = None
+
+    def configure(self, window: float, threshold: float):
+        """Change the policy; samples already held are kept."""
+        self.samples.window = window
+        self.threshold = threshold
+
+    def add(self, moment: float, sample: float) -> bool:
+        """Record a sample. Returns whether value changed and is to be published."""
+        self.samples.add(moment, sample)
+        if self.value is None or abs(sample - self.value) >= self.threshold:
+            self.value = sample
+        elif moment - self._published_at >= self.samples.window:
+            self.value = round(self.samples.mean, 2)
+        else:
+            return False
+
+        self._published_at = moment
+        return True
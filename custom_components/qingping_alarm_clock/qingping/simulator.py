@@ -0,0 +1,129 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from .alarm_table import AlarmTable, SLOT_SIZE, SLOTS_PER_PAGE
+from .const import ALARM_SLOTS_COUNT
+from .protocol import MAIN_CHAR, CFG_WRITE_CHAR, CFG_READ_CHAR, OPCODE_CONFIGURATION, OPCODE_ALARMS
+from .transport import Path
+
+# English, 24h, Celsius, alarms on, UTC+2, 50/50 brightness, night mode off
+DEFAULT_CONFIGURATION = bytes.fromhex("130103ffff01140555150006000100ffffffffff")
+SIMULATOR_SOURCE = "simulator"
+
+
+class SimulatedCharacteristic:
+    __slots__ = ("uuid", "handle")
+
+    def __init__(self, uuid: str, handle: int):
+        self.uuid = uuid
+        self.handle = handle
+
+
+CHARACTERISTICS = {
+    uuid: SimulatedCharacteristic(uuid, handle)
+    for handle, uuid in enumerate((MAIN_CHAR, CFG_WRITE_CHAR, CFG_READ_CHAR), start=1)
+}
+
+
+class SimulatedServices:
+    def get_characteristic(self, uuid: str) -> SimulatedCharacteristic:
+        return CHARACTERISTICS[uuid]
+
+
+class SimulatedClock:
+    """An in-memory CGD1 answering the protocol the way the real clock does.
+
+    Use resolver and client_factory in place of the Bluetooth ones. latency
+    delays every write, and mtu splits notifications the way a small MTU
+    does, to exercise the reassembler.
+    """
+
+    def __init__(
+        self,
+        configuration: bytes = DEFAULT_CONFIGURATION,
+        alarms: bytes | None = None,
+        latency: float = 0.0,
+        mtu: int | None = None,
+        rssi: int = -60
+    ):
+        self.configuration = bytearray(configuration)
+        self.alarms = bytearray(AlarmTable(alarms).to_bytes())
+        self.timestamp: int | None = None
+        self.latency = latency
+        self.mtu = mtu
+        self.rssi = rssi
+        self.writes = 0
+
+    def resolver(self, mac: str) -> list[Path]:
+        return [Path(SIMULATOR_SOURCE, self, self.rssi)]
+
+    @staticmethod
+    def client_factory(device: "SimulatedClock", disconnected_callback: Callable[[Any], None]):
+        return SimulatedClient(device, disconnected_callback)
+
+    def handle_write(self, uuid: str, data: bytes) -> list[bytes]:
+        """Apply one write and return the frames the clock notifies in response."""
+        self.writes += 1
+        if uuid == MAIN_CHAR:
+            if data[:2] == b"\x05\x09":
+                self.timestamp = int.from_bytes(data[2:6], "little")
+            return []
+
+        if data == b"\x01\x02":
+            return [OPCODE_CONFIGURATION + bytes(self.configuration[2:])]
+        if data == b"\x01\x06":
+            table = bytes(self.alarms)
+            page_size = SLOTS_PER_PAGE * SLOT_SIZE
+            return [
+                OPCODE_ALARMS + bytes([offset])
+                + table[offset * SLOT_SIZE:offset * SLOT_SIZE + page_size].ljust(page_size, b"\x00")
+                for offset in range(0, ALARM_SLOTS_COUNT, SLOTS_PER_PAGE)
+            ]
+        if data[:2] == b"\x13\x01" and len(data) == len(self.configuration):
+            self.configuration[:] = data
+        elif data[:2] == b"\x07\x05" and data[2] < ALARM_SLOTS_COUNT:
+            start = data[2] * SLOT_SIZE
+            self.alarms[start:start + SLOT_SIZE] = data[3:3 + SLOT_SIZE]
+        return []
+
+
+class SimulatedClient:
+    """Stands in for BleakClient, talking to a SimulatedClock."""
+
+    def __init__(self, clock: SimulatedClock, disconnected_callback: Callable[[Any], None]):
+        self.clock = clock
+        self.services = SimulatedServices()
+        self._disconnected_callback = disconnected_callback
+        self._notify_callback: Callable[[Any, bytearray], None] | None = None
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def connect(self):
+        await asyncio.sleep(self.clock.latency)
+        self._connected = True
+
+    async def disconnect(self):
+        if self._connected:
+            self._connected = False
+            self._disconnected_callback(self)
+
+    async def start_notify(self, handle: int, callback: Callable[[Any, bytearray], None]):
+        self._notify_callback = callback
+
+    async def write_gatt_char(self, uuid: str, data: bytes):
+        if not self._connected:
+            raise ConnectionError("Simulated clock is not connected")
+        await asyncio.sleep(self.clock.latency)
+
+        loop = asyncio.get_running_loop()
+        characteristic = CHARACTERISTICS[CFG_READ_CHAR]
+        for frame in self.clock.handle_write(uuid, bytes(data)):
+            chunk = self.clock.mtu or len(frame)
+            for start in range(0, len(frame), chunk):
+                # Notifications arrive on a later loop iteration, as over the air
+                if self._notify_callback is not None:
+                    loop.call_soon(self._notify_callback, characteristic, bytearray(frame[start:start + chunk]))
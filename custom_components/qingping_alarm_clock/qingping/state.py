@@ -0,0 +1,76 @@
+import time
+from collections import deque
+from enum import Enum
+
+from .exceptions import InvalidStateTransitionError
+
+
+class ConnectionState(Enum):
+    IDLE = "idle"
+    CONNECTING = "connecting"
+    DISCOVERING = "discovering"
+    AUTHENTICATING = "authenticating"
+    SYNCING = "syncing"
+    READY = "ready"
+    LINGERING = "lingering"
+    DISCONNECTING = "disconnecting"
+
+
+# A dropped link may end any state, so IDLE is reachable from everywhere
+TRANSITIONS = {
+    ConnectionState.IDLE: {ConnectionState.CONNECTING},
+    ConnectionState.CONNECTING: {ConnectionState.DISCOVERING},
+    ConnectionState.DISCOVERING: {ConnectionState.AUTHENTICATING, ConnectionState.DISCONNECTING},
+    ConnectionState.AUTHENTICATING: {
+        ConnectionState.SYNCING, ConnectionState.READY, ConnectionState.DISCONNECTING
+    },
+    ConnectionState.SYNCING: {ConnectionState.READY, ConnectionState.DISCONNECTING},
+    ConnectionState.READY: {ConnectionState.LINGERING, ConnectionState.DISCONNECTING},
+    ConnectionState.LINGERING: {ConnectionState.READY, ConnectionState.DISCONNECTING},
+    ConnectionState.DISCONNECTING: set(),
+}
+
+CONNECTED_STATES = {
+    ConnectionState.DISCOVERING,
+    ConnectionState.AUTHENTICATING,
+    ConnectionState.SYNCING,
+    ConnectionState.READY,
+    ConnectionState.LINGERING,
+}
+
+
+class ConnectionStateMachine:
+    """Owns the connection state of one clock and the time spent in each state."""
+
+    def __init__(self, history_size: int):
+        self.state = ConnectionState.IDLE
+        self.history: deque[tuple[float, ConnectionState]] = deque(maxlen=history_size)
+        self._entered = time.monotonic()
+        self._time_in_state = dict.fromkeys(ConnectionState, 0.0)
+
+    @property
+    def is_connected(self) -> bool:
+        return self.state in CONNECTED_STATES
+
+    def transition(self, state: ConnectionState):
+        if state is not ConnectionState.IDLE and state not in TRANSITIONS[self.state]:
+            raise InvalidStateTransitionError(f"Cannot go from {self.state.value} to {state.value}")
+        if state is self.state:
+            return
+
+        now = time.monotonic()
+        self._time_in_state[self.state] += now - self._entered
+        self._entered = now
+        self.state = state
+        self.history.append((time.time(), state))
+
+    def time_in_state(self) -> dict[ConnectionState, float]:
+        """Seconds spent in each state, the current one included."""
+        times = dict(self._time_in_state)
+        times[self.state] += time.monotonic() - self._entered
+        return times
+
+    def connected_seconds(self) -> float:
+        """Seconds spent connected so far, the current connection included."""
+        times = self.time_in_state()
+        return sum(times[state] for state in CONNECTED_STATES)
@@ -0,0 +1,71 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+
+from .alarm import Alarm
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+class AlarmTimeline:
+    """Weekly ring times of the enabled alarms, sorted by minute of the week.
+
+    Built once per alarm table so that "next alarm after t" is a binary search.
+    Monday 00:00 is minute 0, matching AlarmDay.MONDAY == 1.
+    """
+
+    def __init__(self, alarms: Iterable[Alarm]):
+        entries = []
+        for alarm in alarms:
+            if not alarm.is_configured or not alarm.is_enabled:
+                continue
+            for day in alarm.days:
+                minute = (day.value - 1) * MINUTES_PER_DAY + alarm.hour * 60 + alarm.minute
+                entries.append((minute, alarm.slot))
+
+        entries.sort()
+        self._minutes = [minute for minute, _ in entries]
+        self._slots = [slot for _, slot in entries]
+
+    def __len__(self):
+        return len(self._minutes)
+
+    def next_after(self, moment: datetime) -> tuple[datetime, int] | None:
+        """First ring time strictly after moment, with the slot that rings."""
+        if not self._minutes:
+            return None
+
+        week_start = self._week_start(moment)
+        minute = (moment - week_start) // timedelta(minutes=1)
+
+        index = bisect_right(self._minutes, minute)
+        if index == len(self._minutes):
+            week_start += timedelta(days=7)
+            index = 0
+
+        return week_start + timedelta(minutes=self._minutes[index]), self._slots[index]
+
+    def iter_occurrences(self, start: datetime, end: datetime) -> Iterator[tuple[datetime, int]]:
+        """Ring times in [start, end) in order, expanded one week at a time on demand."""
+        if not self._minutes:
+            return
+
+        week_start = self._week_start(start)
+        index = bisect_left(self._minutes, -(-(start - week_start) // timedelta(minutes=1)))
+        while True:
+            if index == len(self._minutes):
+                week_start += timedelta(days=7)
+                index = 0
+
+            moment = week_start + timedelta(minutes=self._minutes[index])
+            if moment >= end:
+                return
+            yield moment, self._slots[index]
+            index += 1
+
+    @staticmethod
+    def _week_start(moment: datetime) -> datetime:
+        return (moment - timedelta(days=moment.weekday())).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
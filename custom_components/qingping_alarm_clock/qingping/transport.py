@@ -0,0 +1,52 @@
+from collections.abc import Callable
+from typing import Any, NamedTuple, Protocol
+
+
+class Path(NamedTuple):
+    """One way of reaching a clock: an adapter or proxy that can see it."""
+    source: str
+    device: Any
+    rssi: int | None
+
+
+class Client(Protocol):
+    """The part of BleakClient the protocol uses."""
+
+    @property
+    def is_connected(self) -> bool: ...
+
+    @property
+    def services(self) -> Any: ...
+
+    async def connect(self) -> Any: ...
+
+    async def disconnect(self) -> Any: ...
+
+    async def write_gatt_char(self, char_specifier: Any, data: bytes) -> None: ...
+
+    async def start_notify(self, char_specifier: Any, callback: Callable[[Any, bytearray], None]) -> None: ...
+
+
+# Returns every connectable path to a MAC address
+Resolver = Callable[[str], list[Path]]
+# Builds a client for Path.device, calling back with itself once it disconnects
+ClientFactory = Callable[[Any, Callable[[Any], None]], Client]
+
+
+def bleak_client(device: Any, disconnected_callback: Callable[[Any], None]) -> Client:
+    # bleak is imported on first connect, so the codecs load without it
+    from bleak import BleakClient
+
+    return BleakClient(device, disconnected_callback=disconnected_callback)
+
+
+async def scan_with_bleak(timeout: float) -> Resolver:
+    """Scan with the local adapter once and resolve from what was seen, outside any host."""
+    from bleak import BleakScanner
+
+    found = await BleakScanner.discover(timeout=timeout, return_adv=True)
+    paths = {
+        address.upper(): Path("local", device, advertisement.rssi)
+        for address, (device, advertisement) in found.items()
+    }
+    return lambda mac: [paths[mac.upper()]] if mac.upper() in paths else []
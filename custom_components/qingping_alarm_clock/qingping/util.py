@@ -1,5 +1,3 @@
-from functools import wraps
-
 from .alarm import AlarmDay
 
 
@@ -22,12 +20,19 @@ def alarm_days_from_string(days_string: str | None) -> set[AlarmDay] | None:
     return alarm_days
 
 
-def updates_configuration(func):
-    @wraps(func)
-    async def wrapper(self, *args, **kwargs):
-        await self._ensure_connected()
-        await self._ensure_configuration()
-        return_value = await func(self, *args, **kwargs)
-        await self.get_configuration()
-        return return_value
-    return wrapper
+def alarm_days_to_string(days: set[AlarmDay] | None) -> str | None:
+    if days is None:
+        return None
+
+    abbreviation_map = {
+        AlarmDay.MONDAY: "mon",
+        AlarmDay.TUESDAY: "tue",
+        AlarmDay.WEDNESDAY: "wed",
+        AlarmDay.THURSDAY: "thu",
+        AlarmDay.FRIDAY: "fri",
+        AlarmDay.SATURDAY: "sat",
+        AlarmDay.SUNDAY: "sun",
+    }
+
+    return ",".join(abbreviation_map[day] for day in sorted(days, key=lambda day: day.value))
+
@@ -0,0 +1,233 @@
+from __future__ import annotations
+from datetime import datetime, timedelta
+
+from homeassistant.const import CONF_NAME, PERCENTAGE, UnitOfInformation, UnitOfTemperature, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .entity import QingpingEntity
+from .coordinator import (
+    QingpingCoordinator,
+    FIELD_ALARMS,
+    FIELD_AIRTIME,
+    FIELD_TEMPERATURE,
+    FIELD_HUMIDITY
+)
+from .index import async_get_index
+from .const import DOMAIN, SIGNAL_NEXT_ALARM_UPDATED
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    coordinator: QingpingCoordinator = config_entry.runtime_data
+    async_add_entities([
+        QingpingNextAlarmSensor(coordinator, config_entry),
+        *(
+            QingpingAirtimeSensor(coordinator, config_entry, *description)
+            for description in AIRTIME_SENSORS
+        ),
+        *(
+            QingpingClimateSensor(coordinator, config_entry, *description)
+            for description in CLIMATE_SENSORS
+        ),
+    ])
+
+    index = async_get_index(hass)
+    index.sensor_adders[config_entry.entry_id] = async_add_entities
+    config_entry.async_on_unload(
+        lambda: index.sensor_adders.pop(config_entry.entry_id, None)
+    )
+    _async_ensure_fleet_sensor(hass)
+
+
+# Total, name, icon, device class and unit of each daily airtime sensor
+AIRTIME_SENSORS = (
+    ("connected_seconds", "Airtime Today", "mdi:timer-sand", SensorDeviceClass.DURATION, UnitOfTime.SECONDS),
+    ("connections", "Connections Today", "mdi:bluetooth-connect", None, None),
+    ("bytes", "Data Today", "mdi:swap-horizontal", SensorDeviceClass.DATA_SIZE, UnitOfInformation.BYTES),
+)
+
+# Field, name, device class and unit of each advertised reading
+CLIMATE_SENSORS = (
+    (FIELD_TEMPERATURE, "Temperature", SensorDeviceClass.TEMPERATURE, UnitOfTemperature.CELSIUS),
+    (FIELD_HUMIDITY, "Humidity", SensorDeviceClass.HUMIDITY, PERCENTAGE),
+)
+
+
+@callback
+def _async_ensure_fleet_sensor(hass: HomeAssistant):
+    index = async_get_index(hass)
+    if index.fleet_sensor is not None or not index.sensor_adders:
+        return
+
+    entry_id, async_add_entities = next(iter(index.sensor_adders.items()))
+    index.fleet_sensor = QingpingFleetNextAlarmSensor(entry_id)
+    async_add_entities([index.fleet_sensor])
+
+
+class _NextAlarmTimer:
+    """Re-evaluates the sensor when the alarm it shows has rung."""
+
+    _unsub_timer: CALLBACK_TYPE | None = None
+
+    @callback
+    def _schedule_refresh(self, ring_time: datetime | None):
+        self._cancel_refresh()
+        if ring_time is not None:
+            self._unsub_timer = async_track_point_in_time(
+                self.hass, self._handle_ring, ring_time + timedelta(seconds=1)
+            )
+
+    @callback
+    def _cancel_refresh(self):
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _handle_ring(self, now: datetime):
+        self._unsub_timer = None
+        self._refresh()
+        self.async_write_ha_state()
+
+    @callback
+    def _refresh(self):
+        raise NotImplementedError
+
+
+class QingpingNextAlarmSensor(_NextAlarmTimer, QingpingEntity, SensorEntity):
+    _fields = ("alarms_on", FIELD_ALARMS)
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
+        self._attr_name = f"{config_entry.data[CONF_NAME]} Next Alarm"
+        self._attr_unique_id = f"{self._instance.name}_next_alarm"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        self._attr_icon = "mdi:alarm"
+        self._attr_native_value = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        self._cancel_refresh()
+
+    def _update_from_coordinator(self):
+        self._refresh()
+
+    @callback
+    def _refresh(self):
+        next_alarm = self._coordinator.next_alarm(dt_util.now())
+        if next_alarm is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+        else:
+            self._attr_native_value, slot = next_alarm
+            self._attr_extra_state_attributes = {"slot": slot}
+        self._schedule_refresh(self._attr_native_value)
+
+
+class QingpingAirtimeSensor(QingpingEntity, SensorEntity):
+    """One of the daily radio totals of a clock, starting over at local midnight."""
+
+    _fields = (FIELD_AIRTIME,)
+
+    def __init__(self, coordinator, config_entry, total, name, icon, device_class, unit):
+        super().__init__(coordinator, config_entry)
+        self._total = total
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
+        self._attr_unique_id = f"{self._instance.name}_{total}_today"
+        self._attr_icon = icon
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = SensorStateClass.TOTAL
+        self._attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def _update_from_coordinator(self):
+        airtime = self._coordinator.airtime
+        self._attr_native_value = round(airtime.today()[self._total], 1)
+        self._attr_last_reset = dt_util.start_of_local_day()
+        if self._total == "connected_seconds":
+            self._attr_extra_state_attributes = {
+                "budget": airtime.budget or None,
+                "over_budget": airtime.over_budget,
+            }
+
+
+class QingpingClimateSensor(QingpingEntity, SensorEntity):
+    """A reading from the clock's advertisements, written once per sampling window or on a jump."""
+
+    def __init__(self, coordinator, config_entry, field, name, device_class, unit):
+        super().__init__(coordinator, config_entry)
+        self._fields = (field,)
+        self._attr_name = f"{config_entry.data[CONF_NAME]} {name}"
+        self._attr_unique_id = f"{self._instance.name}_{field}"
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_native_value = None
+
+    def _update_from_coordinator(self):
+        sampled = self._coordinator.climate[self._fields[0]]
+        self._attr_native_value = sampled.value
+        samples = sampled.samples
+        if len(samples):
+            self._attr_extra_state_attributes = {
+                "min": samples.min,
+                "max": samples.max,
+                "mean": round(samples.mean, 2),
+                "samples": len(samples),
+            }
+
+
+class QingpingFleetNextAlarmSensor(_NextAlarmTimer, SensorEntity):
+    """The earliest upcoming alarm over every loaded clock."""
+
+    _attr_should_poll = False
+
+    def __init__(self, owner_entry_id: str):
+        self._owner_entry_id = owner_entry_id
+        self._attr_name = "Next Qingping Alarm"
+        self._attr_unique_id = f"{DOMAIN}_next_alarm"
+        self._attr_device_class = SensorDeviceClass.TIMESTAMP
+        self._attr_icon = "mdi:alarm-multiple"
+        self._attr_native_value = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(self.hass, SIGNAL_NEXT_ALARM_UPDATED, self._handle_update)
+        )
+        self._refresh()
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        self._cancel_refresh()
+
+        # Hand the sensor over to another loaded entry
+        index = async_get_index(self.hass)
+        index.fleet_sensor = None
+        index.sensor_adders.pop(self._owner_entry_id, None)
+        _async_ensure_fleet_sensor(self.hass)
+
+    @callback
+    def _handle_update(self):
+        self._refresh()
+        self.async_write_ha_state()
+
+    @callback
+    def _refresh(self):
+        now = dt_util.now()
+        earliest = None
+        for coordinator in async_get_index(self.hass).coordinators:
+            next_alarm = coordinator.next_alarm(now)
+            if next_alarm is not None and (earliest is None or next_alarm[0] < earliest[0]):
+                earliest = (next_alarm[0], coordinator.instance.name, next_alarm[1])
+
+        if earliest is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+        else:
+            self._attr_native_value, name, slot = earliest
+            self._attr_extra_state_attributes = {"clock": name, "slot": slot}
+        self._schedule_refresh(self._attr_native_value)
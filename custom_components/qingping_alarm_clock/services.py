@@ -1,157 +1,441 @@
+import asyncio
 import logging
 import re
 import voluptuous as vol
+from collections.abc import Awaitable, Callable
 from datetime import datetime
 
-from homeassistant.core import HomeAssistant, ServiceCall, callback
-from homeassistant.helpers import device_registry as dr
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback
+)
+from homeassistant.const import ATTR_DEVICE_ID, ENTITY_MATCH_NONE
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH
-from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
 
 from .qingping.util import alarm_days_from_string
-from .qingping import Qingping
+from .qingping.profile import encode_profile, decode_profile
+from .qingping.deadline import Deadline, deadline_scope
+from .qingping.exceptions import DeadlineExceededError
+from .qingping.const import ALARM_SLOTS_COUNT
+from .coordinator import QingpingCoordinator
+from .index import async_get_index
 from .const import (
     DOMAIN,
     SERVICE_SET_ALARM,
+    SERVICE_ADD_ALARM,
     SERVICE_DELETE_ALARM,
     SERVICE_SET_TIME,
     SERVICE_REFRESH,
+    SERVICE_SET_NIGHT_MODE_PROFILE,
+    SERVICE_EXPORT_PROFILE,
+    SERVICE_APPLY_PROFILE,
+    SERVICE_GET_ALARMS,
+    SERVICE_GET_CONFIGURATION,
     CONF_TIME,
-    ALARM_SLOTS_COUNT,
     CONF_ALARM_ENABLED,
     CONF_ALARM_SLOT,
     CONF_ALARM_TIME,
     CONF_ALARM_DAYS,
+    CONF_NIGHT_MODE_ENABLED,
+    CONF_NIGHT_START_TIME,
+    CONF_NIGHT_END_TIME,
+    CONF_DAYTIME_BRIGHTNESS,
+    CONF_NIGHTTIME_BRIGHTNESS,
+    CONF_PROFILE,
+    CONF_MAX_AGE,
+    CONF_DEADLINE,
+    CONF_DEFER,
+    MAX_CONCURRENT_OPERATIONS,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+DEADLINE_FIELDS = {
+    vol.Optional(CONF_DEADLINE): vol.All(vol.Coerce(float), vol.Range(min=1)),
+}
+
+DEFER_FIELDS = {
+    vol.Optional(CONF_DEFER, default=False): cv.boolean,
+}
+
 DAYS_REGEX = re.compile(r"^(mon|tue|wed|thu|fri|sat|sun)(,(mon|tue|wed|thu|fri|sat|sun))*$")
 
 SET_ALARM_SCHEMA = vol.Schema({
-    vol.Required(ATTR_DEVICE_ID): str,
-    vol.Required(CONF_ALARM_SLOT): vol.All(vol.Coerce(int), vol.Range(min=0, max=ALARM_SLOTS_COUNT)),
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
+    **DEFER_FIELDS,
+    vol.Required(CONF_ALARM_SLOT): vol.All(vol.Coerce(int), vol.Range(min=0, max=ALARM_SLOTS_COUNT - 1)),
     vol.Optional(CONF_ALARM_TIME): cv.time,
     vol.Optional(CONF_ALARM_DAYS): vol.All(cv.string, vol.Match(DAYS_REGEX)),
     vol.Optional(CONF_ALARM_ENABLED): cv.boolean,
 })
 
+ADD_ALARM_SCHEMA = vol.Schema({
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
+    **DEFER_FIELDS,
+    vol.Required(CONF_ALARM_TIME): cv.time,
+    vol.Required(CONF_ALARM_DAYS): vol.All(cv.string, vol.Match(DAYS_REGEX)),
+    vol.Optional(CONF_ALARM_ENABLED, default=True): cv.boolean,
+})
+
 DELETE_ALARM_SCHEMA = vol.Schema({
-    vol.Required(ATTR_DEVICE_ID): str,
-    vol.Required(CONF_ALARM_SLOT): vol.All(vol.Coerce(int), vol.Range(min=0, max=ALARM_SLOTS_COUNT)),
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
+    **DEFER_FIELDS,
+    vol.Required(CONF_ALARM_SLOT): vol.All(vol.Coerce(int), vol.Range(min=0, max=ALARM_SLOTS_COUNT - 1)),
 })
 
 SET_TIME_SCHEMA = vol.Schema({
-    vol.Required(ATTR_DEVICE_ID): str,
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
     vol.Required(CONF_TIME): cv.datetime
 })
 
+BRIGHTNESS = vol.All(vol.Coerce(int), vol.In(range(0, 101, 10)))
+
+SET_NIGHT_MODE_PROFILE_SCHEMA = vol.All(
+    vol.Schema({
+        **cv.TARGET_SERVICE_FIELDS,
+        **DEADLINE_FIELDS,
+        **DEFER_FIELDS,
+        vol.Optional(CONF_NIGHT_MODE_ENABLED): cv.boolean,
+        vol.Optional(CONF_NIGHT_START_TIME): cv.time,
+        vol.Optional(CONF_NIGHT_END_TIME): cv.time,
+        vol.Optional(CONF_DAYTIME_BRIGHTNESS): BRIGHTNESS,
+        vol.Optional(CONF_NIGHTTIME_BRIGHTNESS): BRIGHTNESS,
+    }),
+    cv.has_at_least_one_key(
+        CONF_NIGHT_MODE_ENABLED,
+        CONF_NIGHT_START_TIME,
+        CONF_NIGHT_END_TIME,
+        CONF_DAYTIME_BRIGHTNESS,
+        CONF_NIGHTTIME_BRIGHTNESS
+    )
+)
+
+def _profile(value):
+    try:
+        return decode_profile(cv.string(value))
+    except ValueError as e:
+        raise vol.Invalid(str(e))
+
+
+EXPORT_PROFILE_SCHEMA = vol.Schema({
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
+})
+
+APPLY_PROFILE_SCHEMA = vol.Schema({
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
+    **DEFER_FIELDS,
+    vol.Required(CONF_PROFILE): _profile,
+})
+
+GET_STATE_SCHEMA = vol.Schema({
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
+    vol.Optional(CONF_MAX_AGE): cv.positive_time_period,
+})
+
 REFRESH_SCHEMA = vol.Schema({
-    vol.Required(ATTR_DEVICE_ID): str
+    **cv.TARGET_SERVICE_FIELDS,
+    **DEADLINE_FIELDS,
 })
 
+def _age(date: datetime | None) -> int | None:
+    """Seconds since a cached value was read from the clock."""
+    return None if date is None else int((datetime.now() - date).total_seconds())
+
+
 @callback
 def async_register_services(hass: HomeAssistant) -> None:
-    async def async_set_alarm(call: ServiceCall) -> None:
+    index = async_get_index(hass)
+
+    async def async_set_alarm(call: ServiceCall) -> ServiceResponse:
         """Set alarm at the specified slot."""
-        mac = _get_device_mac(hass, call)
-
-        for entry in hass.config_entries.async_entries(DOMAIN):
-            instance: Qingping = entry.runtime_data
-            if instance.mac != mac:
-                continue
-
-            slot = call.data.get(CONF_ALARM_SLOT)
-            is_enabled = call.data.get(CONF_ALARM_ENABLED)
-            time = call.data.get(CONF_ALARM_TIME)
-            days = alarm_days_from_string(call.data.get(CONF_ALARM_DAYS))
-
-            await instance.set_alarm(
-                slot,
-                is_enabled,
-                time,
-                days
-            )
-
-    async def async_delete_alarm(call: ServiceCall) -> None:
+        slot = call.data.get(CONF_ALARM_SLOT)
+        is_enabled = call.data.get(CONF_ALARM_ENABLED)
+        time = call.data.get(CONF_ALARM_TIME)
+        days = alarm_days_from_string(call.data.get(CONF_ALARM_DAYS))
+
+        change = {}
+        if is_enabled is not None:
+            change["enabled"] = is_enabled
+        if time is not None:
+            change["time"] = time
+        if days is not None:
+            change["days"] = days
+
+        async def set_alarm(coordinator: QingpingCoordinator):
+            written = await coordinator.async_set_alarm(slot, change, call.data[CONF_DEFER])
+            return {"queued": not written}
+
+        return await _async_run_on_targets(call, set_alarm)
+
+    async def async_add_alarm(call: ServiceCall) -> ServiceResponse:
+        """Add an alarm in the lowest free slot."""
+        time = call.data[CONF_ALARM_TIME]
+        days = alarm_days_from_string(call.data[CONF_ALARM_DAYS])
+        is_enabled = call.data[CONF_ALARM_ENABLED]
+
+        async def add_alarm(coordinator: QingpingCoordinator):
+            return await coordinator.async_add_alarm(time, days, is_enabled, call.data[CONF_DEFER])
+
+        return await _async_run_on_targets(call, add_alarm)
+
+    async def async_delete_alarm(call: ServiceCall) -> ServiceResponse:
         """Delete alarm at the specified slot."""
-        mac = _get_device_mac(hass, call)
+        slot = int(call.data[CONF_ALARM_SLOT])
 
-        for entry in hass.config_entries.async_entries(DOMAIN):
-            instance: Qingping = entry.runtime_data
-            if instance.mac != mac:
-                continue
+        async def delete_alarm(coordinator: QingpingCoordinator):
+            written = await coordinator.async_set_alarm(slot, {"reset": True}, call.data[CONF_DEFER])
+            return {"queued": not written}
 
-            slot = int(call.data[CONF_ALARM_SLOT])
-            await instance.delete_alarm(slot)
+        return await _async_run_on_targets(call, delete_alarm)
 
-    async def async_set_time(call: ServiceCall) -> None:
+    async def async_set_time(call: ServiceCall) -> ServiceResponse:
         """Set time"""
-        mac = _get_device_mac(hass, call)
+        dt = call.data["time"]
+        timezone_offset = 0
+        if dt.tzinfo is not None:
+            timezone_offset = int(dt.utcoffset().total_seconds() / 60)
+        timestamp = int(dt.timestamp())
 
-        for entry in hass.config_entries.async_entries(DOMAIN):
-            instance: Qingping = entry.runtime_data
-            if instance.mac != mac:
-                continue
+        async def set_time(coordinator: QingpingCoordinator):
+            await coordinator.instance.set_time(timestamp, timezone_offset)
 
-            dt = call.data["time"]
-            timezone_offset = 0
-            if dt.tzinfo is not None:
-                timezone_offset = int(dt.utcoffset().total_seconds() / 60)
-            timestamp = int(dt.timestamp())
-            await instance.set_time(timestamp, timezone_offset)
+        return await _async_run_on_targets(call, set_time)
 
-    async def async_refresh(call: ServiceCall) -> None:
+    async def async_refresh(call: ServiceCall) -> ServiceResponse:
         """Connect to the clock to refresh data"""
-        mac = _get_device_mac(hass, call)
+        async def refresh(coordinator: QingpingCoordinator):
+            instance = coordinator.instance
+            if not await instance.connect():
+                raise HomeAssistantError(f"Could not connect to {instance.name}")
+            # connect() returns at once on a live link, without reading anything
+            await instance.get_configuration()
+            await instance.get_alarms()
+
+        return await _async_run_on_targets(call, refresh)
+
+    async def async_set_night_mode_profile(call: ServiceCall) -> ServiceResponse:
+        """Apply the night mode settings with a single configuration write."""
+        changes = {}
+        if CONF_NIGHT_MODE_ENABLED in call.data:
+            changes["night_mode_enabled"] = call.data[CONF_NIGHT_MODE_ENABLED]
+        if CONF_NIGHT_START_TIME in call.data:
+            changes["night_time_start_time"] = call.data[CONF_NIGHT_START_TIME].replace(second=0)
+        if CONF_NIGHT_END_TIME in call.data:
+            changes["night_time_end_time"] = call.data[CONF_NIGHT_END_TIME].replace(second=0)
+        if CONF_DAYTIME_BRIGHTNESS in call.data:
+            changes["daytime_brightness"] = call.data[CONF_DAYTIME_BRIGHTNESS]
+        if CONF_NIGHTTIME_BRIGHTNESS in call.data:
+            changes["nighttime_brightness"] = call.data[CONF_NIGHTTIME_BRIGHTNESS]
+
+        async def set_night_mode_profile(coordinator: QingpingCoordinator):
+            written = await coordinator.async_set_fields(changes, call.data[CONF_DEFER])
+            return {"queued": not written}
+
+        return await _async_run_on_targets(call, set_night_mode_profile)
+
+    async def async_export_profile(call: ServiceCall) -> ServiceResponse:
+        """Serialize the cached settings and alarms of each clock."""
+        async def export_profile(coordinator: QingpingCoordinator):
+            instance = coordinator.instance
+            if instance.configuration is None or instance.alarms_date is None:
+                raise ServiceValidationError(
+                    "The settings of this clock have not been read yet, refresh it first."
+                )
+            return {"profile": encode_profile(instance.configuration, instance.alarms)}
+
+        return await _async_run_on_targets(call, export_profile)
+
+    async def async_apply_profile(call: ServiceCall) -> ServiceResponse:
+        """Make each clock match an exported profile."""
+        configuration, alarms = call.data[CONF_PROFILE]
+
+        async def apply_profile(coordinator: QingpingCoordinator):
+            written = await coordinator.async_apply_profile(configuration, alarms, call.data[CONF_DEFER])
+            return {"queued": not written}
+
+        return await _async_run_on_targets(call, apply_profile)
 
-        for entry in hass.config_entries.async_entries(DOMAIN):
-            instance: Qingping = entry.runtime_data
-            if instance.mac != mac:
-                continue
+    async def async_get_configuration(call: ServiceCall) -> ServiceResponse:
+        """Return the cached configuration, reading it only if older than max_age."""
+        max_age = call.data.get(CONF_MAX_AGE)
 
-            await instance.connect()
+        async def get_configuration(coordinator: QingpingCoordinator):
+            if max_age is not None:
+                await coordinator.instance.read_configuration(max_age)
+            configuration = coordinator.instance.configuration
+            return {
+                "age": _age(configuration.date if configuration else None),
+                "configuration": coordinator.configuration_as_dict(),
+            }
 
-    def _get_device_mac(hass, call):
-        device_registry = dr.async_get(hass)
-        device_entry = device_registry.async_get(call.data[ATTR_DEVICE_ID])
+        return await _async_run_on_targets(call, get_configuration)
 
-        if device_entry is None:
-            return
+    async def async_get_alarms(call: ServiceCall) -> ServiceResponse:
+        """Return the cached alarm table, reading it only if older than max_age."""
+        max_age = call.data.get(CONF_MAX_AGE)
 
-        mac = None
-        for connection in device_entry.connections:
-            if connection[0] == CONNECTION_BLUETOOTH:
-                mac = connection[1]
-                break
+        async def get_alarms(coordinator: QingpingCoordinator):
+            if max_age is not None:
+                await coordinator.instance.read_alarms(max_age)
+            return {
+                "age": _age(coordinator.instance.alarms_date),
+                "alarms": coordinator.alarms_as_list(),
+            }
 
-        return mac
+        return await _async_run_on_targets(call, get_alarms)
+
+    def _get_targets(call: ServiceCall) -> dict[str, QingpingCoordinator]:
+        selected = async_extract_referenced_entity_ids(hass, call)
+
+        # Explicitly named devices must be clocks, devices pulled in
+        # through areas and labels are simply filtered
+        device_ids = set(selected.referenced_devices)
+        entity_registry = er.async_get(hass)
+        for entity_id in selected.referenced | selected.indirectly_referenced:
+            entity_entry = entity_registry.async_get(entity_id)
+            if entity_entry is not None and entity_entry.device_id is not None:
+                device_ids.add(entity_entry.device_id)
+
+        targets = {}
+        for device_id in cv.ensure_list(call.data.get(ATTR_DEVICE_ID)):
+            if device_id != ENTITY_MATCH_NONE:
+                targets[device_id] = index.get_by_device_id(device_id)
+        for device_id in device_ids & set(index.device_ids):
+            targets[device_id] = index.get_by_device_id(device_id)
+
+        if not targets:
+            raise ServiceValidationError("No Qingping alarm clock matches the service target.")
+
+        return targets
+
+    async def _async_run_on_targets(
+        call: ServiceCall,
+        operation: Callable[[QingpingCoordinator], Awaitable[dict | None]]
+    ) -> ServiceResponse:
+        targets = _get_targets(call)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_OPERATIONS)
+        # One budget for the whole call, waiting for a free slot included
+        deadline = Deadline(call.data[CONF_DEADLINE]) if CONF_DEADLINE in call.data else None
+
+        async def run(device_id: str, coordinator: QingpingCoordinator):
+            instance = coordinator.instance
+            result = {"name": instance.name}
+            async with semaphore:
+                try:
+                    with deadline_scope(deadline):
+                        result.update(await operation(coordinator) or {})
+                except Exception as e:  # one failing clock must not abort the others
+                    _LOGGER.warning(f"{call.service} failed for {instance.mac}: {e}")
+                    result["success"] = False
+                    result["error"] = str(e) or type(e).__name__
+                    # The coordinator wraps library errors for the frontend
+                    cause = e.__cause__ or e
+                    if isinstance(cause, DeadlineExceededError):
+                        result["phase"] = cause.phase
+                    return device_id, result
+
+            result["success"] = True
+            return device_id, result
+
+        results = dict(await asyncio.gather(
+            *(run(device_id, coordinator) for device_id, coordinator in targets.items())
+        ))
+
+        if not any(result["success"] for result in results.values()):
+            errors = "; ".join(f"{result['name']}: {result['error']}" for result in results.values())
+            raise HomeAssistantError(f"{call.service} failed: {errors}")
+
+        return {"devices": results}
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_ALARM,
         async_set_alarm,
-        schema=SET_ALARM_SCHEMA
+        schema=SET_ALARM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ADD_ALARM,
+        async_add_alarm,
+        schema=ADD_ALARM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
     )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_DELETE_ALARM,
         async_delete_alarm,
-        schema=DELETE_ALARM_SCHEMA
+        schema=DELETE_ALARM_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
     )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_TIME,
         async_set_time,
-        schema=SET_TIME_SCHEMA
+        schema=SET_TIME_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
     )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_REFRESH,
         async_refresh,
-        schema=REFRESH_SCHEMA
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_NIGHT_MODE_PROFILE,
+        async_set_night_mode_profile,
+        schema=SET_NIGHT_MODE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_PROFILE,
+        async_export_profile,
+        schema=EXPORT_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        async_apply_profile,
+        schema=APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_CONFIGURATION,
+        async_get_configuration,
+        schema=GET_STATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY
+    )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ALARMS,
+        async_get_alarms,
+        schema=GET_STATE_SCHEMA,
+        supports_response=SupportsResponse.ONLY
     )
@@ -0,0 +1,69 @@
+"""Last known configuration, alarm table and airtime of a clock, kept across restarts."""
+from __future__ import annotations
+from datetime import date, datetime
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .qingping.alarm_table import AlarmTable
+from .qingping.configuration import Configuration
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
+
+
+class QingpingStateCache:
+    """Raw frames are stored so restoring them costs one decode per clock."""
+
+    def __init__(self, hass: HomeAssistant, mac: str):
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.state.{mac.replace(':', '').lower()}"
+        )
+        self._data: dict = {}
+
+    async def async_load(self) -> dict:
+        self._data = await self._store.async_load() or {}
+        return self._data
+
+    @property
+    def configuration(self) -> tuple[bytes, datetime] | None:
+        if "configuration" not in self._data:
+            return None
+        return (
+            bytes.fromhex(self._data["configuration"]),
+            datetime.fromisoformat(self._data["configuration_date"])
+        )
+
+    @property
+    def alarms(self) -> tuple[bytes, datetime] | None:
+        if "alarms" not in self._data:
+            return None
+        return (
+            bytes.fromhex(self._data["alarms"]),
+            datetime.fromisoformat(self._data["alarms_date"])
+        )
+
+    @property
+    def airtime(self) -> tuple[date, dict[str, float]] | None:
+        if "airtime" not in self._data:
+            return None
+        airtime = dict(self._data["airtime"])
+        return date.fromisoformat(airtime.pop("date")), airtime
+
+    @callback
+    def put_configuration(self, configuration: Configuration):
+        self._data["configuration"] = configuration.to_bytes().hex()
+        self._data["configuration_date"] = configuration.date.isoformat()
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+    @callback
+    def put_alarms(self, alarms: AlarmTable, date: datetime):
+        self._data["alarms"] = alarms.to_bytes().hex()
+        self._data["alarms_date"] = date.isoformat()
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+    @callback
+    def put_airtime(self, day: date, totals: dict[str, float]):
+        self._data["airtime"] = {"date": day.isoformat(), **totals}
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
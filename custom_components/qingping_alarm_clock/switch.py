@@ -1,85 +1,65 @@
 from __future__ import annotations
-from typing import Any
 
 from homeassistant.const import CONF_NAME
-from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.components.switch import SwitchEntity
 
-from .qingping import Qingping
-from .qingping.alarm import Alarm
-from .entity import async_device_device_info_fn
-from .qingping.configuration import Configuration
-from .qingping.events import ALARMS_UPDATE, DEVICE_CONFIG_UPDATE
+from .entity import QingpingEntity
+from .coordinator import QingpingCoordinator, FIELD_ALARMS
 
 async def async_setup_entry(hass, config_entry, async_add_entities):
-    instance: Qingping = config_entry.runtime_data
+    coordinator: QingpingCoordinator = config_entry.runtime_data
     async_add_entities([
-        QingpingAlarmsSwitch(instance, config_entry),
-        QingpingNightModeSwitch(instance, config_entry)
+        QingpingAlarmsSwitch(coordinator, config_entry),
+        QingpingNightModeSwitch(coordinator, config_entry)
     ])
 
 
-class QingpingAlarmsSwitch(SwitchEntity):
-    def __init__(self, instance, config_entry):
-        self._instance: Qingping = instance
-        self._config_entry = config_entry
+class QingpingAlarmsSwitch(QingpingEntity, SwitchEntity):
+    _fields = ("alarms_on", FIELD_ALARMS)
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
         self._attr_name = f"{config_entry.data[CONF_NAME]} Alarms Enabled"
-        self._attr_unique_id = f"{instance.name}_alarms_enabled"
+        self._attr_unique_id = f"{self._instance.name}_alarms_enabled"
         self._attr_is_on = None
         self._attr_icon = "mdi:alarm-check"
         self._attr_extra_state_attributes = {}
 
-        instance.eventbus.add_listener(DEVICE_CONFIG_UPDATE, self.config_updated)
-        instance.eventbus.add_listener(ALARMS_UPDATE, self.alarms_updated)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return async_device_device_info_fn(self._instance, self._config_entry.data[CONF_NAME])
-
     async def async_turn_on(self, **kwargs):
-        await self._instance.enable_alarms(True)
+        await self._coordinator.async_set_field("alarms_on", True)
 
     async def async_turn_off(self, **kwargs):
-        await self._instance.enable_alarms(False)
+        await self._coordinator.async_set_field("alarms_on", False)
 
-    async def config_updated(self, config: Configuration):
-        self._attr_is_on = config.alarms_on
-        self.schedule_update_ha_state()
+    def _update_from_coordinator(self):
+        self._attr_is_on = self._coordinator.value("alarms_on")
 
-    async def alarms_updated(self, alarms: list[Alarm]):
         self._attr_extra_state_attributes = {}
-        for alarm in alarms:
+        for alarm in self._coordinator.alarms:
             if alarm.is_configured:
                 alarm_dict = {}
                 alarm_dict["is_on"] = alarm.is_enabled
                 alarm_dict["time"] = alarm.time
                 alarm_dict["days"] = alarm.days_string
                 self._attr_extra_state_attributes[f"alarm_{alarm.slot}"] = alarm_dict
-        self.schedule_update_ha_state()
 
 
-class QingpingNightModeSwitch(SwitchEntity):
-    def __init__(self, instance, config_entry):
-        self._instance: Qingping = instance
-        self._config_entry = config_entry
+class QingpingNightModeSwitch(QingpingEntity, SwitchEntity):
+    _fields = ("night_mode_enabled",)
+
+    def __init__(self, coordinator, config_entry):
+        super().__init__(coordinator, config_entry)
         self._attr_name = f"{config_entry.data[CONF_NAME]} Night Mode Enabled"
-        self._attr_unique_id = f"{instance.name}_night_mode_enabled"
+        self._attr_unique_id = f"{self._instance.name}_night_mode_enabled"
         self._attr_is_on = None
         self._attr_icon = "mdi:sun-clock"
         self._attr_extra_state_attributes = {}
 
-        instance.eventbus.add_listener(DEVICE_CONFIG_UPDATE, self.config_updated)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        return async_device_device_info_fn(self._instance, self._config_entry.data[CONF_NAME])
-
     async def async_turn_on(self, **kwargs):
-        await self._instance.set_night_mode(True)
+        await self._coordinator.async_set_field("night_mode_enabled", True)
 
     async def async_turn_off(self, **kwargs):
-        await self._instance.set_night_mode(False)
+        await self._coordinator.async_set_field("night_mode_enabled", False)
 
-    async def config_updated(self, config: Configuration):
-        self._attr_is_on = config.night_mode_enabled
-        self.schedule_update_ha_state()
+    def _update_from_coordinator(self):
+        self._attr_is_on = self._coordinator.value("night_mode_enabled")
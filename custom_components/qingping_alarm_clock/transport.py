@@ -0,0 +1,18 @@
+"""Bluetooth paths to a Qingping CGD1 Alarm Clock, as seen by Home Assistant."""
+from __future__ import annotations
+
+from homeassistant.components.bluetooth import async_scanner_devices_by_address
+from homeassistant.core import HomeAssistant
+
+from .qingping.transport import Path, Resolver
+
+
+def async_get_resolver(hass: HomeAssistant) -> Resolver:
+    """Every connectable adapter and proxy that currently sees a clock."""
+    def resolve(mac: str) -> list[Path]:
+        return [
+            Path(device.scanner.source, device.ble_device, device.advertisement.rssi)
+            for device in async_scanner_devices_by_address(hass, mac, connectable=True)
+        ]
+
+    return resolve
@@ -0,0 +1,154 @@
+"""Durable queue of writes waiting for an out-of-range clock."""
+from __future__ import annotations
+from datetime import datetime, time as dtime
+from enum import Enum
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .qingping.configuration import Language
+from .qingping.util import alarm_days_from_string, alarm_days_to_string
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 1
+
+TIME_FIELDS = {"night_time_start_time", "night_time_end_time"}
+ENUM_FIELDS = {"language": Language}
+
+
+class QingpingWriteQueue:
+    """Pending configuration fields and alarm slots of one clock.
+
+    Configuration fields are merged last-write-wins and alarm changes are
+    merged per slot, so a flush always needs one configuration frame plus
+    at most one frame per touched slot.
+
+    Deferred entries wait for a connection that happens anyway, but no
+    later than deferred_until. A single urgent entry makes the whole queue
+    due, since everything goes out in the same session.
+    """
+
+    def __init__(self, hass: HomeAssistant, mac: str):
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.queue.{mac.replace(':', '').lower()}"
+        )
+        self.config: dict[str, Any] = {}
+        self.alarms: dict[int, dict] = {}
+        self.deferred_until: datetime | None = None
+
+    def __bool__(self):
+        return bool(self.config or self.alarms)
+
+    async def async_load(self):
+        data = await self._store.async_load() or {}
+        self.config = {
+            field: _decode_field(field, value)
+            for field, value in data.get("config", {}).items()
+        }
+        self.alarms = {
+            int(slot): _decode_alarm(change)
+            for slot, change in data.get("alarms", {}).items()
+        }
+        if self and data.get("deferred_until"):
+            self.deferred_until = dt_util.parse_datetime(data["deferred_until"])
+
+    def is_due(self, now: datetime | None = None) -> bool:
+        """Whether the queue should be flushed on its own instead of waiting."""
+        if not self:
+            return False
+        if self.deferred_until is None:
+            return True
+        return (now or dt_util.utcnow()) >= self.deferred_until
+
+    @callback
+    def put_config(self, changes: dict[str, Any], defer_until: datetime | None = None):
+        self._defer(defer_until)
+        self.config.update(changes)
+        self._async_schedule_save()
+
+    @callback
+    def put_alarm(self, slot: int, change: dict, defer_until: datetime | None = None):
+        self._defer(defer_until)
+        if change.get("reset") or slot not in self.alarms:
+            self.alarms[slot] = dict(change)
+        else:
+            self.alarms[slot].update(change)
+        self._async_schedule_save()
+
+    @callback
+    def discard(self, config: dict[str, Any], alarms: dict[int, dict]):
+        """Drop flushed entries, keeping those that were overwritten meanwhile."""
+        for field, value in config.items():
+            if self.config.get(field) == value:
+                del self.config[field]
+        for slot, change in alarms.items():
+            if self.alarms.get(slot) == change:
+                del self.alarms[slot]
+        if not self:
+            self.deferred_until = None
+        self._async_schedule_save()
+
+    def _defer(self, defer_until: datetime | None):
+        """Call before adding an entry; None makes the queue due now."""
+        if defer_until is None:
+            self.deferred_until = None
+        elif not self:
+            self.deferred_until = defer_until
+        elif self.deferred_until is not None:
+            self.deferred_until = min(self.deferred_until, defer_until)
+
+    @callback
+    def _async_schedule_save(self):
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {
+            "config": {
+                field: encode_field(value)
+                for field, value in self.config.items()
+            },
+            "alarms": {
+                str(slot): _encode_alarm(change)
+                for slot, change in self.alarms.items()
+            },
+            "deferred_until": self.deferred_until.isoformat() if self.deferred_until else None,
+        }
+
+
+def encode_field(value):
+    """JSON-friendly form of a configuration value."""
+    if isinstance(value, dtime):
+        return value.strftime("%H:%M")
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def _decode_field(field: str, value):
+    if field in TIME_FIELDS:
+        return dtime.fromisoformat(value)
+    if field in ENUM_FIELDS:
+        return ENUM_FIELDS[field](value)
+    return value
+
+
+def _encode_alarm(change: dict) -> dict:
+    encoded = dict(change)
+    if "time" in encoded:
+        encoded["time"] = encoded["time"].strftime("%H:%M")
+    if "days" in encoded:
+        encoded["days"] = alarm_days_to_string(encoded["days"])
+    return encoded
+
+
+def _decode_alarm(change: dict) -> dict:
+    decoded = dict(change)
+    if "time" in decoded:
+        decoded["time"] = dtime.fromisoformat(decoded["time"])
+    if "days" in decoded:
+        decoded["days"] = alarm_days_from_string(decoded["days"])
+    return decoded
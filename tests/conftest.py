@@ -0,0 +1,9 @@
+"""Make the protocol library importable as `qingping`, without Home Assistant.
+
+The integration directory is appended, not prepended: its select.py and
+time.py platforms would otherwise shadow the standard library modules.
+"""
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "custom_components" / "qingping_alarm_clock"))
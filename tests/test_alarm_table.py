@@ -0,0 +1,55 @@
+from datetime import time
+
+import pytest
+
+from qingping.alarm import AlarmDay, UNSET
+from qingping.alarm_table import AlarmTable, SLOT_SIZE
+from qingping.const import ALARM_SLOTS_COUNT
+
+
+def test_new_table_is_empty():
+    table = AlarmTable()
+    assert len(table) == ALARM_SLOTS_COUNT
+    assert not any(alarm.is_configured for alarm in table)
+    assert table.to_bytes() == bytes([UNSET] * ALARM_SLOTS_COUNT * SLOT_SIZE)
+
+
+def test_alarms_are_live_views():
+    table = AlarmTable()
+    alarm = table[4]
+    alarm.is_enabled = True
+    alarm.time = time(7, 30)
+    alarm.days = {AlarmDay.MONDAY, AlarmDay.FRIDAY}
+
+    assert table[4].is_configured
+    assert table[4].time == time(7, 30)
+    assert table[4].days == [AlarmDay.MONDAY, AlarmDay.FRIDAY]
+    assert table[4].to_bytes() == bytes([0x07, 0x05, 4, 1, 7, 30, 0b10001, 0])
+
+
+def test_copy_detaches_from_table():
+    table = AlarmTable()
+    alarm = table[0].copy()
+    alarm.hour = 6
+    assert table[0].hour is None
+
+
+def test_write_page_drops_padding_past_last_slot():
+    table = AlarmTable()
+    table.write_page(18, bytes([1, 6, 0, 0x7f, 0]) + bytes(10))
+    assert table[18].time == time(6, 0)
+    assert len(table.to_bytes()) == ALARM_SLOTS_COUNT * SLOT_SIZE
+
+
+def test_changed_slots():
+    table = AlarmTable()
+    before = table.to_bytes()
+    table.write_page(3, bytes([1, 8, 15, 1, 0]) * 3)
+    assert table.changed_slots(before) == [3, 4, 5]
+    assert table.changed_slots(table.to_bytes()) == []
+    assert table.changed_slots(None) == list(range(ALARM_SLOTS_COUNT))
+
+
+def test_slot_out_of_range():
+    with pytest.raises(IndexError):
+        AlarmTable()[ALARM_SLOTS_COUNT]
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from qingping.deadline import (
+    Deadline,
+    check_deadline,
+    deadline_scope,
+    detached_context,
+    with_deadline,
+    within,
+)
+from qingping.exceptions import DeadlineExceededError
+
+
+def test_within_without_deadline_keeps_the_timeout():
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await within("reading back", asyncio.sleep(1), 0.01)
+
+    asyncio.run(run())
+
+
+def test_deadline_names_the_phase():
+    async def run():
+        with deadline_scope(0.01):
+            await within("connecting", asyncio.sleep(1))
+
+    with pytest.raises(DeadlineExceededError) as error:
+        asyncio.run(run())
+    assert error.value.phase == "connecting"
+
+
+def test_timeout_tighter_than_deadline_stays_a_timeout():
+    async def run():
+        with deadline_scope(10):
+            with pytest.raises(asyncio.TimeoutError) as error:
+                await within("reading back", asyncio.sleep(1), 0.01)
+            assert not isinstance(error.value, DeadlineExceededError)
+
+    asyncio.run(run())
+
+
+def test_expired_deadline_fails_fast():
+    async def run():
+        with deadline_scope(Deadline(-1)):
+            check_deadline("writing")
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(run())
+
+
+def test_tighter_outer_deadline_wins():
+    with deadline_scope(-1):
+        with deadline_scope(60):
+            with pytest.raises(DeadlineExceededError):
+                check_deadline("writing")
+
+
+def test_with_deadline_keyword():
+    @with_deadline
+    async def operation():
+        await within("syncing", asyncio.sleep(1))
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(operation(deadline=0.01))
+
+
+def test_detached_context_drops_the_deadline():
+    with deadline_scope(-1):
+        detached_context().run(check_deadline, "listening")
@@ -0,0 +1,36 @@
+import base64
+
+import pytest
+
+from qingping.alarm_table import AlarmTable
+from qingping.configuration import Configuration
+from qingping.profile import decode_profile, encode_profile
+from qingping.simulator import DEFAULT_CONFIGURATION
+
+
+def test_round_trip():
+    alarms = AlarmTable()
+    alarms.write_page(0, bytes([1, 6, 45, 0x1f, 0]) * 3)
+    profile = encode_profile(Configuration(DEFAULT_CONFIGURATION), alarms)
+
+    configuration, decoded = decode_profile(profile)
+    assert configuration.to_bytes() == Configuration(DEFAULT_CONFIGURATION).to_bytes()
+    assert decoded.to_bytes() == alarms.to_bytes()
+
+
+def test_rejects_invalid_base64():
+    with pytest.raises(ValueError):
+        decode_profile("not a profile!")
+
+
+def test_rejects_truncated_profile():
+    profile = encode_profile(Configuration(DEFAULT_CONFIGURATION), AlarmTable())
+    with pytest.raises(ValueError):
+        decode_profile(base64.b64encode(base64.b64decode(profile)[:-1]).decode())
+
+
+def test_rejects_unknown_version():
+    data = bytearray(base64.b64decode(encode_profile(Configuration(DEFAULT_CONFIGURATION), AlarmTable())))
+    data[0] = 0xff
+    with pytest.raises(ValueError):
+        decode_profile(base64.b64encode(bytes(data)).decode())
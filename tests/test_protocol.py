@@ -0,0 +1,39 @@
+from qingping.protocol import FrameReassembler, OPCODE_ALARMS, OPCODE_CONFIGURATION
+
+CONFIGURATION_FRAME = OPCODE_CONFIGURATION + bytes(range(18))
+ALARMS_FRAME = OPCODE_ALARMS + bytes(range(16))
+
+
+def test_whole_frame_passes_through():
+    assert list(FrameReassembler().feed(CONFIGURATION_FRAME)) == [CONFIGURATION_FRAME]
+
+
+def test_split_frame_is_joined():
+    reassembler = FrameReassembler()
+    assert list(reassembler.feed(ALARMS_FRAME[:7])) == []
+    assert list(reassembler.feed(ALARMS_FRAME[7:12])) == []
+    assert list(reassembler.feed(ALARMS_FRAME[12:])) == [ALARMS_FRAME]
+
+
+def test_frames_sharing_a_notification_are_split():
+    frames = list(FrameReassembler().feed(ALARMS_FRAME + CONFIGURATION_FRAME))
+    assert frames == [ALARMS_FRAME, CONFIGURATION_FRAME]
+
+
+def test_unknown_opcode_passes_through():
+    assert list(FrameReassembler().feed(b"\x04\xff\x01")) == [b"\x04\xff\x01"]
+
+
+def test_complete_frame_drops_lost_partial():
+    reassembler = FrameReassembler()
+    list(reassembler.feed(ALARMS_FRAME[:5]))
+    assert list(reassembler.feed(CONFIGURATION_FRAME)) == [CONFIGURATION_FRAME]
+    assert reassembler.dropped_bytes == 5
+
+
+def test_reset_counts_dropped_bytes():
+    reassembler = FrameReassembler()
+    list(reassembler.feed(CONFIGURATION_FRAME[:4]))
+    reassembler.reset()
+    assert reassembler.dropped_bytes == 4
+    assert list(reassembler.feed(ALARMS_FRAME)) == [ALARMS_FRAME]
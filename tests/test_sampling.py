@@ -0,0 +1,45 @@
+from qingping.sampling import SampledValue, SampleWindow
+
+
+def test_window_statistics():
+    window = SampleWindow(window=10, capacity=8)
+    for moment, value in enumerate((3.0, 1.0, 4.0, 1.0, 5.0)):
+        window.add(moment, value)
+    assert (window.min, window.max, window.mean) == (1.0, 5.0, 2.8)
+
+
+def test_old_samples_leave_the_window():
+    window = SampleWindow(window=10, capacity=8)
+    window.add(0, 100.0)
+    window.add(5, 1.0)
+    window.add(10, 2.0)
+    assert len(window) == 2
+    assert (window.min, window.max, window.mean) == (1.0, 2.0, 1.5)
+
+
+def test_ring_holds_at_most_capacity_samples():
+    window = SampleWindow(window=100, capacity=3)
+    for moment, value in enumerate((9.0, 1.0, 2.0, 3.0)):
+        window.add(moment, value)
+    assert len(window) == 3
+    assert (window.min, window.max) == (1.0, 3.0)
+
+
+def test_empty_window():
+    window = SampleWindow(window=10, capacity=4)
+    assert (window.min, window.max, window.mean) == (None, None, None)
+
+
+def test_sampled_value_publishes_mean_once_per_window():
+    value = SampledValue(window=60, threshold=1.0, capacity=16)
+    assert value.add(0, 20.0)
+    assert not value.add(30, 20.4)
+    assert value.add(60, 20.2)
+    assert value.value == 20.3  # the sample at 0 has left the window
+
+
+def test_sampled_value_publishes_large_moves_at_once():
+    value = SampledValue(window=60, threshold=1.0, capacity=16)
+    value.add(0, 20.0)
+    assert value.add(1, 21.5)
+    assert value.value == 21.5
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import time
+
+import pytest
+
+from qingping import AlarmDay, Qingping
+from qingping.exceptions import DeadlineExceededError, NotConnectedError
+from qingping.simulator import SimulatedClock
+from qingping.state import ConnectionState
+
+MAC = "AA:BB:CC:DD:EE:FF"
+
+
+def _instance(clock: SimulatedClock) -> Qingping:
+    return Qingping(MAC, "Bedroom", clock.resolver, clock.client_factory, discovery_delay=0)
+
+
+def test_connect_reads_state():
+    async def run():
+        instance = _instance(SimulatedClock(mtu=7))
+        assert await instance.connect()
+        assert instance.state.state is ConnectionState.LINGERING
+        assert instance.configuration.sound_volume == 3
+        assert instance.alarms_date is not None
+        await instance.disconnect()
+        assert instance.state.state is ConnectionState.IDLE
+
+    asyncio.run(run())
+
+
+def test_writes_reach_the_clock():
+    async def run():
+        clock = SimulatedClock()
+        instance = _instance(clock)
+        await instance.update_alarms({2: {"enabled": True, "time": time(6, 45), "days": {AlarmDay.SUNDAY}}})
+        await instance.update_configuration({"sound_volume": 5})
+        await instance.set_time(1700000000)
+        await instance.disconnect()
+        return clock
+
+    clock = asyncio.run(run())
+    assert clock.alarms[10:14] == bytes([1, 6, 45, 0x40])
+    assert clock.configuration[2] == 5
+    assert clock.timestamp is not None
+
+
+def test_unchanged_write_is_skipped():
+    async def run():
+        clock = SimulatedClock()
+        instance = _instance(clock)
+        await instance.connect()
+        writes = clock.writes
+        assert not await instance.update_configuration({"sound_volume": 3})
+        assert clock.writes == writes
+        assert instance.counters["writes_skipped"] == 1
+        await instance.disconnect()
+
+    asyncio.run(run())
+
+
+def test_nothing_is_written_without_a_link():
+    async def run():
+        with pytest.raises(NotConnectedError):
+            await _instance(SimulatedClock()).get_configuration()
+
+    asyncio.run(run())
+
+
+def test_unreachable_clock_fails_to_connect():
+    async def run():
+        clock = SimulatedClock()
+        instance = Qingping(MAC, "Bedroom", lambda mac: [], clock.client_factory, discovery_delay=0)
+        assert not await instance.connect()
+        assert instance.state.state is ConnectionState.IDLE
+
+    asyncio.run(run())
+
+
+def test_deadline_bounds_a_slow_clock():
+    async def run():
+        instance = _instance(SimulatedClock(latency=1))
+        with pytest.raises(DeadlineExceededError) as error:
+            await instance.connect(deadline=0.1)
+        assert error.value.phase == "connecting"
+        assert instance.state.state is ConnectionState.IDLE
+
+    asyncio.run(run())
@@ -0,0 +1,55 @@
+import pytest
+
+from qingping.exceptions import InvalidStateTransitionError
+from qingping.state import ConnectionState, ConnectionStateMachine
+
+CONNECT_PATH = (
+    ConnectionState.CONNECTING,
+    ConnectionState.DISCOVERING,
+    ConnectionState.AUTHENTICATING,
+    ConnectionState.SYNCING,
+    ConnectionState.READY,
+    ConnectionState.LINGERING,
+    ConnectionState.DISCONNECTING,
+    ConnectionState.IDLE,
+)
+
+
+def test_full_connection():
+    machine = ConnectionStateMachine(history_size=20)
+    for state in CONNECT_PATH:
+        machine.transition(state)
+    assert [state for _, state in machine.history] == list(CONNECT_PATH)
+    assert not machine.is_connected
+
+
+def test_rejects_transition_outside_table():
+    machine = ConnectionStateMachine(history_size=20)
+    with pytest.raises(InvalidStateTransitionError):
+        machine.transition(ConnectionState.READY)
+    assert machine.state is ConnectionState.IDLE
+
+
+def test_dropped_link_returns_to_idle_from_any_state():
+    machine = ConnectionStateMachine(history_size=20)
+    machine.transition(ConnectionState.CONNECTING)
+    machine.transition(ConnectionState.DISCOVERING)
+    assert machine.is_connected
+    machine.transition(ConnectionState.IDLE)
+    assert machine.state is ConnectionState.IDLE
+
+
+def test_history_is_bounded():
+    machine = ConnectionStateMachine(history_size=3)
+    for state in CONNECT_PATH:
+        machine.transition(state)
+    assert [state for _, state in machine.history] == list(CONNECT_PATH[-3:])
+
+
+def test_time_in_state_counts_the_current_state():
+    machine = ConnectionStateMachine(history_size=20)
+    machine.transition(ConnectionState.CONNECTING)
+    machine.transition(ConnectionState.DISCOVERING)
+    times = machine.time_in_state()
+    assert times[ConnectionState.DISCOVERING] >= 0
+    assert machine.connected_seconds() == pytest.approx(times[ConnectionState.DISCOVERING], abs=0.01)
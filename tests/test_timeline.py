@@ -0,0 +1,56 @@
+from datetime import datetime, time
+
+from qingping.alarm import AlarmDay
+from qingping.alarm_table import AlarmTable
+from qingping.timeline import AlarmTimeline
+
+# A Monday
+MONDAY = datetime(2024, 1, 1)
+
+
+def _table(*alarms) -> AlarmTable:
+    table = AlarmTable()
+    for slot, (enabled, at, days) in enumerate(alarms):
+        table[slot].is_enabled = enabled
+        table[slot].time = at
+        table[slot].days = days
+    return table
+
+
+def test_empty_timeline():
+    timeline = AlarmTimeline(AlarmTable())
+    assert len(timeline) == 0
+    assert timeline.next_after(MONDAY) is None
+    assert list(timeline.iter_occurrences(MONDAY, datetime(2024, 2, 1))) == []
+
+
+def test_disabled_alarms_are_left_out():
+    timeline = AlarmTimeline(_table(
+        (False, time(6, 0), {AlarmDay.MONDAY}),
+        (True, time(7, 0), {AlarmDay.MONDAY, AlarmDay.WEDNESDAY}),
+    ))
+    assert len(timeline) == 2
+    assert timeline.next_after(MONDAY) == (datetime(2024, 1, 1, 7, 0), 1)
+
+
+def test_next_after_is_strictly_after():
+    timeline = AlarmTimeline(_table((True, time(7, 0), {AlarmDay.MONDAY, AlarmDay.WEDNESDAY})))
+    assert timeline.next_after(datetime(2024, 1, 1, 7, 0)) == (datetime(2024, 1, 3, 7, 0), 0)
+
+
+def test_next_after_wraps_to_next_week():
+    timeline = AlarmTimeline(_table((True, time(7, 0), {AlarmDay.MONDAY})))
+    assert timeline.next_after(datetime(2024, 1, 6, 12, 0)) == (datetime(2024, 1, 8, 7, 0), 0)
+
+
+def test_iter_occurrences():
+    timeline = AlarmTimeline(_table(
+        (True, time(7, 0), {AlarmDay.MONDAY}),
+        (True, time(9, 30), {AlarmDay.SUNDAY}),
+    ))
+    occurrences = list(timeline.iter_occurrences(datetime(2024, 1, 1, 7, 0), datetime(2024, 1, 8, 7, 1)))
+    assert occurrences == [
+        (datetime(2024, 1, 1, 7, 0), 0),
+        (datetime(2024, 1, 7, 9, 30), 1),
+        (datetime(2024, 1, 8, 7, 0), 0),
+    ]